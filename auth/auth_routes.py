@@ -1,29 +1,34 @@
 import os
 import uuid
 from datetime import datetime, timedelta
-from bson import ObjectId
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends
 from jose import jwt, JWTError
 
 from database import get_collections
 from auth.auth_models import LoginRequest, RefreshRequest
 from auth.auth_service import create_access_token, create_refresh_token
+from auth.dependencies import get_current_user
+from auth.passwords import verify_password, hash_password
+from auth.profile_cache import profile_cache
+from auth.revocation import revocations
+from routers.admins import require_super_admin
 
-# SQLite imports
-from sqlite_db import SessionLocal
-from auth.sqlite_session_model import Session as SQLiteSession
+# SQLite session repository (runs off the event loop)
+from auth.session_store import SessionRecord, IDLE_TIMEOUT_MINUTES
+from auth.sessions import session_store, activity_buffer
 
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
-IDLE_TIMEOUT_MINUTES = 120
 
 @router.get("/debug-sessions")
-def debug_sessions():
-    db_sqlite = SessionLocal()
-    sessions = db_sqlite.query(SQLiteSession).all()
-    db_sqlite.close()
-    return {"count": len(sessions)}
+async def debug_sessions():
+    return {"count": await session_store.count()}
+
+
+@router.get("/session-stats")
+async def session_stats(user=Depends(require_super_admin)):
+    return await session_store.stats()
 
 
 # ================= LOGIN =================
@@ -32,22 +37,38 @@ async def login(data: LoginRequest):
 
     cols = get_collections()
 
-    user = await cols["clients"].find_one({
-        "email_id": data.email,
-        "status": "Active"
-    })
+    # Password and status come from Mongo, not the profile cache
+    user = await profile_cache.get_for_login(data.email)
+
+    if not user:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+
+    valid, needs_rehash = await verify_password(data.password, user.get("password"))
 
-    if not user or user["password"] != data.password:
+    if not valid:
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
+    # Migrate plaintext / weaker hashes on successful login
+    if needs_rehash:
+        await cols["clients"].update_one(
+            {"_id": user["_id"], "password": user["password"]},
+            {"$set": {"password": await hash_password(data.password)}}
+        )
+        profile_cache.invalidate(client_id=user["_id"])
+
+    session_id = str(uuid.uuid4())
+
+    # "sid" binds both tokens to the session so revocation reaches access tokens
     access_token = create_access_token({
         "sub": str(user["_id"]),
         "username": user["client_name"],
-        "role": user["role"]
+        "role": user["role"],
+        "sid": session_id
     })
 
     refresh_token = create_refresh_token({
-        "sub": str(user["_id"])
+        "sub": str(user["_id"]),
+        "sid": session_id
     })
 
     decoded_refresh = jwt.decode(
@@ -56,26 +77,17 @@ async def login(data: LoginRequest):
         algorithms=["HS256"]
     )
 
-    session_id = str(uuid.uuid4())
-
     # ✅ Store Session in SQLite
-    db_sqlite = SessionLocal()
-
-    new_session = SQLiteSession(
+    await session_store.create(SessionRecord(
         session_id=session_id,
         client_id=str(user["_id"]),
         refresh_jti=decoded_refresh["jti"],
-        refresh_token=refresh_token,
         device_info="web",
         issued_at=datetime.utcnow(),
         expires_at=datetime.utcnow() + timedelta(days=15),
         last_activity=datetime.utcnow(),
         revoked=False
-    )
-
-    db_sqlite.add(new_session)
-    db_sqlite.commit()
-    db_sqlite.close()
+    ))
 
     return {
         "access_token": access_token,
@@ -89,8 +101,6 @@ async def login(data: LoginRequest):
 @router.post("/refresh")
 async def refresh(data: RefreshRequest):
 
-    cols = get_collections()
-
     try:
         payload = jwt.decode(
             data.refresh_token,
@@ -105,32 +115,25 @@ async def refresh(data: RefreshRequest):
         client_id = payload.get("sub")
 
         # ✅ Get Session from SQLite
-        db_sqlite = SessionLocal()
-
-        session = db_sqlite.query(SQLiteSession).filter(
-            SQLiteSession.client_id == client_id,
-            SQLiteSession.refresh_jti == refresh_jti,
-            SQLiteSession.revoked == False
-        ).first()
+        session = await session_store.find_active(client_id, refresh_jti)
 
         if not session:
-            db_sqlite.close()
             raise HTTPException(status_code=401, detail="Session not found")
 
-        # Idle Timeout Check
-        if datetime.utcnow() - session.last_activity > timedelta(minutes=IDLE_TIMEOUT_MINUTES):
-            session.revoked = True
-            db_sqlite.commit()
-            db_sqlite.close()
+        # Idle Timeout Check (buffered activity is newer than the stored one)
+        last_activity = activity_buffer.last_seen(session.session_id) or session.last_activity
+
+        if datetime.utcnow() - last_activity > timedelta(minutes=IDLE_TIMEOUT_MINUTES):
+            activity_buffer.discard(session.session_id)
+            await session_store.revoke(session.session_id)
+            revocations.add(session.session_id)
             raise HTTPException(status_code=401, detail="Session expired due to inactivity")
 
-        # Update Last Activity
-        session.last_activity = datetime.utcnow()
-        db_sqlite.commit()
-        db_sqlite.close()
+        # Update Last Activity (written behind in batches)
+        activity_buffer.touch(session.session_id, datetime.utcnow())
 
-        # Fetch full user details from Mongo
-        user = await cols["clients"].find_one({"_id": ObjectId(client_id)})
+        # User details from the profile cache (Mongo on miss)
+        user = await profile_cache.get_by_id(client_id)
 
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
@@ -138,7 +141,8 @@ async def refresh(data: RefreshRequest):
         new_access_token = create_access_token({
             "sub": str(client_id),
             "username": user["client_name"],
-            "role": user["role"]
+            "role": user["role"],
+            "sid": session.session_id
         })
 
         return {
@@ -161,19 +165,27 @@ async def logout(data: RefreshRequest):
             algorithms=["HS256"]
         )
 
-        db_sqlite = SessionLocal()
-
-        session = db_sqlite.query(SQLiteSession).filter(
-            SQLiteSession.refresh_jti == payload.get("jti")
-        ).first()
-
-        if session:
-            session.revoked = True
-            db_sqlite.commit()
+        await session_store.revoke_by_jti(payload.get("jti"))
 
-        db_sqlite.close()
+        # Other workers pick this up on their next revocation poll
+        revocations.add(payload.get("sid"))
 
         return {"message": "Logged out successfully"}
 
     except:
         raise HTTPException(status_code=401, detail="Invalid token")
+
+
+# ================= LOGOUT ALL DEVICES =================
+@router.post("/logout-all")
+async def logout_all(device_info: str | None = None, user=Depends(get_current_user)):
+
+    revoked = await session_store.revoke_all(user["client_id"], device_info)
+
+    if revoked:
+        await revocations.sync()
+
+    return {
+        "message": "Logged out from all devices" if device_info is None else "Logged out from device",
+        "revoked_sessions": revoked
+    }
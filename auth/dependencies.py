@@ -1,15 +1,57 @@
 import os
-from datetime import datetime, timedelta
+import time
+import logging
+import hashlib
+from collections import OrderedDict
 from fastapi import Depends, HTTPException
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import jwt, JWTError
-from bson import ObjectId
-from database import get_collections
+from auth.auth_service import SECRET_KEY, ALGORITHM
+from auth.revocation import revocations
 
 security = HTTPBearer()
 
-ALGORITHM = "HS256"
+logger = logging.getLogger(__name__)
+
 IDLE_TIMEOUT_MINUTES = 120  # 1 hour
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+
+
+class TokenCache:
+    """
+    Bounded LRU of verified access tokens, keyed by the token's sha256.
+    An entry is only served until the token's own `exp`.
+    """
+
+    def __init__(self, max_size=TOKEN_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries = OrderedDict()  # digest -> (user, exp)
+
+    @staticmethod
+    def key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        if entry[1] <= time.time():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, user, exp):
+        self._entries[key] = (user, exp)
+        self._entries.move_to_end(key)
+
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+
+token_cache = TokenCache()
 
 
 async def get_current_user(
@@ -17,15 +59,18 @@ async def get_current_user(
 ):
     token = credentials.credentials
 
-    SECRET_KEY = os.getenv("SECRET_KEY")
-
-    if not SECRET_KEY:
-        raise HTTPException(status_code=500, detail="SECRET_KEY not configured")
+    cache_key = TokenCache.key(token)
+    user = token_cache.get(cache_key)
+    if user is not None:
+        if revocations.is_revoked(user["session_id"]):
+            raise HTTPException(status_code=401, detail="Session revoked")
+        return dict(user)
 
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
 
-        print("Decoded Payload:", payload)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Decoded payload for sub=%s", payload.get("sub"))
 
         if payload.get("type") != "access":
             raise HTTPException(status_code=401, detail="Invalid token type")
@@ -34,12 +79,22 @@ async def get_current_user(
         if not client_id:
             raise HTTPException(status_code=401, detail="Invalid token payload")
 
-        return {
+        user = {
             "client_id": client_id,
             "username": payload.get("username"),
-            "role": payload.get("role")
+            "role": payload.get("role"),
+            "session_id": payload.get("sid")
         }
 
+        if revocations.is_revoked(user["session_id"]):
+            raise HTTPException(status_code=401, detail="Session revoked")
+
+        if payload.get("exp"):
+            token_cache.put(cache_key, user, payload["exp"])
+
+        return dict(user)
+
     except JWTError as e:
-        print("JWT ERROR:", str(e))
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("JWT error: %s", e)
         raise HTTPException(status_code=401, detail="Invalid or expired access token")
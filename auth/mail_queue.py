@@ -0,0 +1,136 @@
+import os
+import time
+import uuid
+import random
+import asyncio
+import logging
+from collections import OrderedDict
+import httpx
+
+logger = logging.getLogger(__name__)
+
+MAIL_QUEUE_SIZE = int(os.getenv("MAIL_QUEUE_SIZE", "1000"))
+MAIL_WORKERS = int(os.getenv("MAIL_WORKERS", "4"))
+MAIL_MAX_ATTEMPTS = int(os.getenv("MAIL_MAX_ATTEMPTS", "4"))
+MAIL_BACKOFF_SECONDS = float(os.getenv("MAIL_BACKOFF_SECONDS", "0.5"))
+MAIL_TIMEOUT_SECONDS = float(os.getenv("MAIL_TIMEOUT_SECONDS", "10"))
+MAIL_STATUS_RETENTION = int(os.getenv("MAIL_STATUS_RETENTION", "10000"))
+
+
+class MailQueueFull(Exception):
+    pass
+
+
+class MailQueue:
+    """
+    Bounded in-memory outbound mail queue. Worker tasks POST each message
+    over one shared keep-alive HTTP client, retrying transport errors,
+    429 and 5xx responses with exponential backoff.
+    """
+
+    def __init__(
+        self,
+        url,
+        workers=MAIL_WORKERS,
+        max_size=MAIL_QUEUE_SIZE,
+        max_attempts=MAIL_MAX_ATTEMPTS,
+        backoff_seconds=MAIL_BACKOFF_SECONDS,
+        timeout_seconds=MAIL_TIMEOUT_SECONDS
+    ):
+        self.url = url
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.timeout_seconds = timeout_seconds
+        self._queue = asyncio.Queue(maxsize=max_size)
+        self._statuses = OrderedDict()
+        self._client = None
+        self._tasks = []
+
+    async def start(self):
+        self._client = httpx.AsyncClient(
+            timeout=self.timeout_seconds,
+            limits=httpx.Limits(
+                max_connections=self.workers,
+                max_keepalive_connections=self.workers
+            )
+        )
+        self._tasks = [
+            asyncio.create_task(self._worker())
+            for _ in range(self.workers)
+        ]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+
+    async def join(self):
+        await self._queue.join()
+
+    def enqueue(self, payload: dict, headers: dict) -> str:
+        """
+        Queues a message without waiting; returns its delivery id
+        """
+        message_id = str(uuid.uuid4())
+
+        try:
+            self._queue.put_nowait((message_id, payload, headers))
+        except asyncio.QueueFull:
+            raise MailQueueFull("Mail queue is full")
+
+        self._set_status(message_id, status="queued", attempts=0, error=None, queued_at=time.time())
+        return message_id
+
+    def status(self, message_id: str) -> dict | None:
+        status = self._statuses.get(message_id)
+        return dict(status) if status else None
+
+    def _set_status(self, message_id, **fields):
+        status = self._statuses.setdefault(message_id, {"id": message_id})
+        status.update(fields)
+        self._statuses.move_to_end(message_id)
+
+        while len(self._statuses) > MAIL_STATUS_RETENTION:
+            self._statuses.popitem(last=False)
+
+    async def _worker(self):
+        while True:
+            message_id, payload, headers = await self._queue.get()
+            try:
+                await self._deliver(message_id, payload, headers)
+            except Exception as e:
+                logger.exception("Mail worker error")
+                self._set_status(message_id, status="failed", error=str(e))
+            finally:
+                self._queue.task_done()
+
+    async def _deliver(self, message_id, payload, headers):
+        for attempt in range(1, self.max_attempts + 1):
+            self._set_status(message_id, status="sending", attempts=attempt)
+
+            try:
+                response = await self._client.post(self.url, json=payload, headers=headers)
+            except httpx.TransportError as e:
+                error, retryable = f"{type(e).__name__}: {e}", True
+            else:
+                if response.status_code in (200, 201, 202):
+                    self._set_status(message_id, status="sent", error=None, sent_at=time.time())
+                    return
+
+                error = f"HTTP {response.status_code}: {response.text[:200]}"
+                retryable = response.status_code == 429 or response.status_code >= 500
+
+            if not retryable or attempt == self.max_attempts:
+                logger.warning("Mail %s failed after %d attempt(s): %s", message_id, attempt, error)
+                self._set_status(message_id, status="failed", error=error)
+                return
+
+            self._set_status(message_id, status="retrying", error=error)
+            delay = self.backoff_seconds * 2 ** (attempt - 1)
+            await asyncio.sleep(delay + random.uniform(0, delay / 2))
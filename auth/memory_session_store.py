@@ -0,0 +1,96 @@
+from datetime import datetime
+from dataclasses import replace
+from auth.session_store import SessionStore, SessionRecord, is_stale
+
+
+class MemorySessionStore(SessionStore):
+    """
+    Process-local session store for tests and single-worker development.
+    Sessions are lost on restart.
+    """
+
+    def __init__(self):
+        self._sessions = {}
+        self._by_jti = {}
+
+    async def create(self, record: SessionRecord):
+        self._sessions[record.session_id] = replace(record)
+        self._by_jti[record.refresh_jti] = record.session_id
+
+    async def find_active(self, client_id, refresh_jti) -> SessionRecord | None:
+        record = self._sessions.get(self._by_jti.get(refresh_jti))
+
+        if not record or record.client_id != client_id or record.revoked:
+            return None
+
+        return replace(record)
+
+    async def touch_many(self, activity: dict):
+        for session_id, last_activity in activity.items():
+            record = self._sessions.get(session_id)
+            if record:
+                record.last_activity = last_activity
+
+    async def revoke(self, session_id):
+        record = self._sessions.get(session_id)
+        if record and not record.revoked:
+            record.revoked = True
+            record.revoked_at = datetime.utcnow()
+
+    async def revoke_by_jti(self, refresh_jti):
+        await self.revoke(self._by_jti.get(refresh_jti))
+
+    async def revoke_all(self, client_id, device_info=None) -> int:
+        revoked = 0
+
+        for record in self._sessions.values():
+            if record.client_id != client_id or record.revoked:
+                continue
+            if device_info is not None and record.device_info != device_info:
+                continue
+
+            record.revoked = True
+            record.revoked_at = datetime.utcnow()
+            revoked += 1
+
+        return revoked
+
+    async def revoked_since(self, since) -> list:
+        return [
+            (record.session_id, record.revoked_at)
+            for record in self._sessions.values()
+            if record.revoked_at and record.revoked_at >= since
+        ]
+
+    async def count(self) -> int:
+        return len(self._sessions)
+
+    async def _stats(self, now, idle_before) -> dict:
+        revoked = expired = 0
+
+        for record in self._sessions.values():
+            if record.revoked:
+                revoked += 1
+            elif record.expires_at < now or record.last_activity < idle_before:
+                expired += 1
+
+        total = len(self._sessions)
+
+        return {
+            "active": total - revoked - expired,
+            "revoked": revoked,
+            "expired": expired,
+            "total": total
+        }
+
+    async def delete_stale_batch(self, now, revoked_before, idle_before, batch_size) -> int:
+        stale = [
+            record for record in self._sessions.values()
+            if is_stale(record, now, revoked_before, idle_before)
+        ][:batch_size]
+
+        for record in stale:
+            del self._sessions[record.session_id]
+            self._by_jti.pop(record.refresh_jti, None)
+
+        return len(stale)
@@ -0,0 +1,130 @@
+from datetime import datetime
+from dataclasses import asdict
+from pymongo import UpdateOne
+from database import get_collections
+from auth.session_store import SessionStore, SessionRecord
+
+
+SESSION_PROJECTION = {"_id": 0}
+
+
+def _to_record(doc):
+    return SessionRecord(**doc)
+
+
+def _to_doc(record: SessionRecord):
+    doc = asdict(record)
+    doc["_id"] = record.session_id
+    return doc
+
+
+class MongoSessionStore(SessionStore):
+    """
+    Sessions in the Mongo "sessions" collection (indexes in
+    database.INDEXES). Expired sessions are also removed by the
+    TTL index on expires_at, independently of the sweeper.
+    """
+
+    def _col(self):
+        return get_collections()["sessions_col"]
+
+    async def create(self, record: SessionRecord):
+        await self._col().insert_one(_to_doc(record))
+
+    async def find_active(self, client_id, refresh_jti) -> SessionRecord | None:
+        doc = await self._col().find_one(
+            {"client_id": client_id, "refresh_jti": refresh_jti, "revoked": False},
+            SESSION_PROJECTION
+        )
+
+        return _to_record(doc) if doc else None
+
+    async def touch_many(self, activity: dict):
+        if not activity:
+            return
+
+        await self._col().bulk_write([
+            UpdateOne({"_id": session_id}, {"$set": {"last_activity": last_activity}})
+            for session_id, last_activity in activity.items()
+        ], ordered=False)
+
+    async def revoke(self, session_id):
+        await self._col().update_one(
+            {"_id": session_id, "revoked": False},
+            {"$set": {"revoked": True, "revoked_at": datetime.utcnow()}}
+        )
+
+    async def revoke_by_jti(self, refresh_jti):
+        await self._col().update_one(
+            {"refresh_jti": refresh_jti, "revoked": False},
+            {"$set": {"revoked": True, "revoked_at": datetime.utcnow()}}
+        )
+
+    async def revoke_all(self, client_id, device_info=None) -> int:
+        query = {"client_id": client_id, "revoked": False}
+
+        if device_info is not None:
+            query["device_info"] = device_info
+
+        result = await self._col().update_many(
+            query,
+            {"$set": {"revoked": True, "revoked_at": datetime.utcnow()}}
+        )
+        return result.modified_count
+
+    async def revoked_since(self, since) -> list:
+        docs = await self._col().find(
+            {"revoked_at": {"$gte": since}},
+            {"_id": 1, "revoked_at": 1}
+        ).to_list(length=None)
+
+        return [(d["_id"], d["revoked_at"]) for d in docs]
+
+    async def count(self) -> int:
+        return await self._col().count_documents({})
+
+    async def _stats(self, now, idle_before) -> dict:
+        expired = {
+            "$and": [
+                {"$eq": ["$revoked", False]},
+                {"$or": [
+                    {"$lt": ["$expires_at", now]},
+                    {"$lt": ["$last_activity", idle_before]}
+                ]}
+            ]
+        }
+
+        result = await self._col().aggregate([
+            {"$group": {
+                "_id": None,
+                "total": {"$sum": 1},
+                "revoked": {"$sum": {"$cond": ["$revoked", 1, 0]}},
+                "expired": {"$sum": {"$cond": [expired, 1, 0]}}
+            }}
+        ]).to_list(length=1)
+
+        counts = result[0] if result else {"total": 0, "revoked": 0, "expired": 0}
+
+        return {
+            "active": counts["total"] - counts["revoked"] - counts["expired"],
+            "revoked": counts["revoked"],
+            "expired": counts["expired"],
+            "total": counts["total"]
+        }
+
+    async def delete_stale_batch(self, now, revoked_before, idle_before, batch_size) -> int:
+        stale = await self._col().find(
+            {"$or": [
+                {"expires_at": {"$lt": now}},
+                {"revoked_at": {"$lt": revoked_before}},
+                {"revoked": True, "revoked_at": None, "last_activity": {"$lt": revoked_before}},
+                {"revoked": False, "last_activity": {"$lt": idle_before}}
+            ]},
+            {"_id": 1}
+        ).limit(batch_size).to_list(length=batch_size)
+
+        if not stale:
+            return 0
+
+        result = await self._col().delete_many({"_id": {"$in": [s["_id"] for s in stale]}})
+        return result.deleted_count
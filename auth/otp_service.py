@@ -1,24 +1,34 @@
 import os
 import random
-import requests
+import logging
 from dotenv import load_dotenv
+from auth.mail_queue import MailQueue, MailQueueFull
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 BREVO_API_KEY = os.getenv("BREVO_API_KEY")
 SENDER_EMAIL = os.getenv("SENDER_EMAIL")
 
-BREVO_URL = "https://api.brevo.com/v3/smtp/email"
+BREVO_URL = os.getenv("BREVO_URL", "https://api.brevo.com/v3/smtp/email")
+
+# Started / stopped in the FastAPI lifespan
+mail_queue = MailQueue(BREVO_URL)
 
 
 def generate_otp() -> str:
     return str(random.randint(100000, 999999))
 
 
-def send_otp_email(otp: str, receiver_email: str, role: str) -> bool:
+def send_otp_email(otp: str, receiver_email: str, role: str) -> str | None:
+    """
+    Queues the OTP email for async delivery.
+    Returns the delivery id (see get_delivery_status) or None if not queued.
+    """
     if not BREVO_API_KEY or not SENDER_EMAIL:
-        print(" Missing BREVO_API_KEY or SENDER_EMAIL")
-        return False
+        logger.error("Missing BREVO_API_KEY or SENDER_EMAIL")
+        return None
 
     headers = {
         "accept": "application/json",
@@ -40,20 +50,14 @@ def send_otp_email(otp: str, receiver_email: str, role: str) -> bool:
     }
 
     try:
-        response = requests.post(
-            BREVO_URL,
-            json=payload,
-            headers=headers,
-            timeout=10
-        )
+        return mail_queue.enqueue(payload, headers)
+    except MailQueueFull:
+        logger.error("OTP email dropped: mail queue is full")
+        return None
 
-        if response.status_code in (200, 201, 202):
-            print(" OTP sent successfully")
-            return True
-        else:
-            print(f" Brevo error: {response.text}")
-            return False
 
-    except requests.RequestException as e:
-        print(f" Email error: {e}")
-        return False
+def get_delivery_status(message_id: str) -> dict | None:
+    """
+    {"id", "status": queued|sending|retrying|sent|failed, "attempts", "error", ...}
+    """
+    return mail_queue.status(message_id)
@@ -0,0 +1,72 @@
+import os
+import hmac
+import base64
+import asyncio
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+import bcrypt
+
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 2)))
+PASSWORD_HASH_ROUNDS = int(os.getenv("PASSWORD_HASH_ROUNDS", "12"))
+
+BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
+
+# bcrypt releases the GIL, so a thread pool keeps the event loop free;
+# the semaphore bounds how much hashing work is in flight at once
+_executor = ThreadPoolExecutor(
+    max_workers=PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash"
+)
+_slots = asyncio.Semaphore(PASSWORD_HASH_WORKERS)
+
+
+def is_hashed(stored: str) -> bool:
+    return stored.startswith(BCRYPT_PREFIXES)
+
+
+def _prehash(password: str) -> bytes:
+    # bcrypt only reads 72 bytes; a sha256 digest keeps long passwords intact
+    return base64.b64encode(hashlib.sha256(password.encode()).digest())
+
+
+def _hash(password: str) -> str:
+    return bcrypt.hashpw(_prehash(password), bcrypt.gensalt(PASSWORD_HASH_ROUNDS)).decode()
+
+
+def _verify(password: str, hashed: str) -> bool:
+    try:
+        return bcrypt.checkpw(_prehash(password), hashed.encode())
+    except ValueError:
+        # Malformed or truncated hash with a bcrypt prefix: a failed login, not a 500
+        return False
+
+
+async def _run(fn, *args):
+    async with _slots:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_executor, fn, *args)
+
+
+async def hash_password(password: str) -> str:
+    return await _run(_hash, password)
+
+
+async def verify_password(password: str, stored: str | None) -> tuple[bool, bool]:
+    """
+    Returns (valid, needs_rehash). Legacy plaintext records and hashes
+    with fewer rounds than configured need a rehash after a valid login.
+    """
+    if not stored:
+        return False, False
+
+    if not is_hashed(stored):
+        valid = hmac.compare_digest(stored.encode(), password.encode())
+        return valid, valid
+
+    if not await _run(_verify, password, stored):
+        return False, False
+
+    # checkpw accepted it, so the cost field is well-formed
+    rounds = int(stored.split("$")[2])
+
+    return True, rounds < PASSWORD_HASH_ROUNDS
@@ -0,0 +1,111 @@
+import os
+import time
+from collections import OrderedDict
+from bson import ObjectId
+from bson.errors import InvalidId
+from database import get_collections
+
+PROFILE_CACHE_TTL_SECONDS = int(os.getenv("PROFILE_CACHE_TTL_SECONDS", "300"))
+PROFILE_CACHE_SIZE = int(os.getenv("PROFILE_CACHE_SIZE", "10000"))
+
+PROFILE_PROJECTION = {
+    "_id": 1,
+    "email_id": 1,
+    "client_name": 1,
+    "role": 1,
+    "status": 1
+}
+
+# Login always reads these from Mongo; the password hash is never cached
+LOGIN_PROJECTION = {**PROFILE_PROJECTION, "password": 1}
+
+
+class ProfileCache:
+    """
+    TTL cache of client profiles for refresh and role checks, keyed by _id
+    with a secondary email → _id index.
+
+    Invalidation is per process, so the cache holds no credential: login
+    checks the password and status against Mongo on every call and only
+    refreshes the cached profile from that read.
+    """
+
+    def __init__(self, ttl_seconds=PROFILE_CACHE_TTL_SECONDS, max_size=PROFILE_CACHE_SIZE):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._by_id = OrderedDict()  # str(_id) -> (profile, expires_at)
+        self._by_email = {}          # email_id -> str(_id), Active profiles only
+
+    def _get(self, client_id):
+        entry = self._by_id.get(client_id)
+        if not entry:
+            return None
+
+        if entry[1] <= time.monotonic():
+            self.invalidate(client_id=client_id)
+            return None
+
+        self._by_id.move_to_end(client_id)
+        return entry[0]
+
+    def _put(self, profile):
+        client_id = str(profile["_id"])
+        self._by_id[client_id] = (profile, time.monotonic() + self.ttl_seconds)
+        self._by_id.move_to_end(client_id)
+
+        if profile.get("status") == "Active" and profile.get("email_id"):
+            self._by_email[profile["email_id"]] = client_id
+
+        while len(self._by_id) > self.max_size:
+            old_id, (old_profile, _) = self._by_id.popitem(last=False)
+            if self._by_email.get(old_profile.get("email_id")) == old_id:
+                del self._by_email[old_profile["email_id"]]
+
+    async def get_for_login(self, email_id):
+        """
+        Active client with its password hash, always read from Mongo
+        """
+        user = await get_collections()["clients"].find_one(
+            {"email_id": email_id, "status": "Active"},
+            LOGIN_PROJECTION
+        )
+
+        if user:
+            self._put({k: v for k, v in user.items() if k != "password"})
+        else:
+            self.invalidate(email_id=email_id)
+
+        return user
+
+    async def get_by_id(self, client_id):
+        profile = self._get(client_id)
+        if profile:
+            return profile
+
+        try:
+            object_id = ObjectId(client_id)
+        except (InvalidId, TypeError):
+            return None
+
+        profile = await get_collections()["clients"].find_one(
+            {"_id": object_id},
+            PROFILE_PROJECTION
+        )
+
+        if profile:
+            self._put(profile)
+
+        return profile
+
+    def invalidate(self, client_id=None, email_id=None):
+        if email_id is not None:
+            client_id = client_id or self._by_email.get(email_id)
+            self._by_email.pop(email_id, None)
+
+        if client_id is not None:
+            entry = self._by_id.pop(str(client_id), None)
+            if entry and self._by_email.get(entry[0].get("email_id")) == str(client_id):
+                del self._by_email[entry[0]["email_id"]]
+
+
+profile_cache = ProfileCache()
@@ -0,0 +1,76 @@
+import os
+import asyncio
+from datetime import datetime, timedelta
+from auth.auth_service import ACCESS_TOKEN_EXPIRE_MINUTES
+from auth.sessions import session_store
+
+REVOCATION_POLL_SECONDS = int(os.getenv("REVOCATION_POLL_SECONDS", "5"))
+# Re-read this far behind the high-water mark so revocations committed
+# late by another worker (or with a slightly older clock) are not missed
+REVOCATION_POLL_OVERLAP_SECONDS = int(os.getenv("REVOCATION_POLL_OVERLAP_SECONDS", "10"))
+
+
+class RevocationSet:
+    """
+    Session ids revoked within the last access-token lifetime, synced
+    from the session store by polling revoked_at past a high-water mark.
+    get_current_user checks the `sid` claim against it in O(1).
+    """
+
+    def __init__(self, store, interval=REVOCATION_POLL_SECONDS):
+        self._store = store
+        self.interval = interval
+        self.retention = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+        self.overlap = timedelta(seconds=REVOCATION_POLL_OVERLAP_SECONDS)
+        self._revoked = {}  # session_id -> revoked_at
+        self._high_water = None
+
+    def __len__(self):
+        return len(self._revoked)
+
+    def is_revoked(self, session_id) -> bool:
+        return session_id in self._revoked
+
+    def add(self, session_id, revoked_at=None):
+        """
+        Local add on logout, so this worker rejects the token immediately
+        """
+        if session_id:
+            self._revoked[session_id] = revoked_at or datetime.utcnow()
+
+    async def sync(self):
+        now = datetime.utcnow()
+
+        # Older revocations only cover access tokens that have expired anyway
+        since = now - self.retention
+        if self._high_water is not None:
+            since = max(since, self._high_water - self.overlap)
+
+        for session_id, revoked_at in await self._store.revoked_since(since):
+            self._revoked[session_id] = revoked_at
+            if self._high_water is None or revoked_at > self._high_water:
+                self._high_water = revoked_at
+
+        if self._high_water is None:
+            self._high_water = since
+
+        self._prune(now - self.retention)
+
+    def _prune(self, before):
+        for session_id in [s for s, at in self._revoked.items() if at < before]:
+            del self._revoked[session_id]
+
+    async def run_forever(self):
+        """
+        Background job started in the FastAPI lifespan
+        """
+        while True:
+            await asyncio.sleep(self.interval)
+
+            try:
+                await self.sync()
+            except Exception as e:
+                print("REVOCATION SYNC ERROR:", e)
+
+
+revocations = RevocationSet(session_store)
@@ -0,0 +1,232 @@
+import os
+import asyncio
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+IDLE_TIMEOUT_MINUTES = 120
+SESSION_ACTIVITY_FLUSH_SECONDS = int(os.getenv("SESSION_ACTIVITY_FLUSH_SECONDS", "30"))
+
+# sqlite (default, SQLite in WAL mode) | mongo (sessions collection, TTL expiry) | memory (tests)
+SESSION_BACKEND = os.getenv("SESSION_BACKEND", "sqlite")
+
+# Sweeper
+SESSION_SWEEP_INTERVAL_SECONDS = int(os.getenv("SESSION_SWEEP_INTERVAL_SECONDS", "600"))
+SESSION_SWEEP_BATCH_SIZE = int(os.getenv("SESSION_SWEEP_BATCH_SIZE", "500"))
+SESSION_VACUUM_EVERY_SWEEPS = int(os.getenv("SESSION_VACUUM_EVERY_SWEEPS", "144"))
+# Revoked rows are kept for one access-token lifetime after revoked_at, so
+# every worker's revocation poll sees them while their access tokens live
+SESSION_REVOKED_RETENTION_MINUTES = int(os.getenv("SESSION_REVOKED_RETENTION_MINUTES", "60"))
+
+
+@dataclass
+class SessionRecord:
+    session_id: str
+    client_id: str
+    refresh_jti: str
+    device_info: str
+    issued_at: datetime
+    expires_at: datetime
+    last_activity: datetime
+    revoked: bool = False
+    revoked_at: datetime | None = None
+
+
+def is_stale(record: SessionRecord, now, revoked_before, idle_before) -> bool:
+    """
+    Sweeper predicate shared by the backends that filter in Python
+    """
+    if record.expires_at < now:
+        return True
+    if record.revoked:
+        return (record.revoked_at or record.last_activity) < revoked_before
+    return record.last_activity < idle_before
+
+
+class SessionStore(ABC):
+    """
+    Session store interface. Backends: SQLiteSessionStore,
+    MongoSessionStore and MemorySessionStore (built by auth.sessions).
+    """
+
+    async def init(self):
+        """
+        Called in the FastAPI lifespan before the first request
+        """
+
+    def shutdown(self):
+        pass
+
+    @abstractmethod
+    async def create(self, record: SessionRecord):
+        pass
+
+    @abstractmethod
+    async def find_active(self, client_id, refresh_jti) -> SessionRecord | None:
+        pass
+
+    @abstractmethod
+    async def touch_many(self, activity: dict):
+        """
+        {session_id: last_activity} written in one batch
+        """
+
+    @abstractmethod
+    async def revoke(self, session_id):
+        pass
+
+    @abstractmethod
+    async def revoke_by_jti(self, refresh_jti):
+        pass
+
+    @abstractmethod
+    async def revoke_all(self, client_id, device_info=None) -> int:
+        """
+        Revokes every live session of a client (optionally one device)
+        in a single write; returns the number of sessions revoked
+        """
+
+    @abstractmethod
+    async def revoked_since(self, since) -> list:
+        """
+        [(session_id, revoked_at)] for sessions revoked at or after `since`
+        """
+
+    @abstractmethod
+    async def count(self) -> int:
+        pass
+
+    async def stats(self) -> dict:
+        """
+        {"active", "revoked", "expired", "total"} without loading sessions
+        """
+        now = datetime.utcnow()
+        idle_before = now - timedelta(minutes=IDLE_TIMEOUT_MINUTES)
+        return await self._stats(now, idle_before)
+
+    @abstractmethod
+    async def _stats(self, now, idle_before) -> dict:
+        pass
+
+    @abstractmethod
+    async def delete_stale_batch(self, now, revoked_before, idle_before, batch_size) -> int:
+        pass
+
+    async def optimize(self, vacuum=False):
+        pass
+
+
+class ActivityBuffer:
+    """
+    Write-behind buffer for session last_activity. Refreshes record the
+    touch in memory; flush() writes all of them in one batched UPDATE.
+    """
+
+    def __init__(self, store, interval=SESSION_ACTIVITY_FLUSH_SECONDS):
+        self._store = store
+        self.interval = interval
+        self._pending = {}
+        self._in_flight = {}  # batch being written; one at a time under _lock
+        self._lock = asyncio.Lock()
+
+    def touch(self, session_id, last_activity):
+        self._pending[session_id] = last_activity
+
+    def last_seen(self, session_id):
+        """
+        Buffered activity not yet written to the store, if any
+        """
+        return self._pending.get(session_id) or self._in_flight.get(session_id)
+
+    def discard(self, session_id):
+        self._pending.pop(session_id, None)
+
+    async def flush(self):
+        # The background job and shutdown can both flush; one at a time
+        async with self._lock:
+            if not self._pending:
+                return
+
+            batch, self._pending = self._pending, {}
+            self._in_flight = batch
+
+            try:
+                await self._store.touch_many(batch)
+            except BaseException:
+                # Failed or cancelled: keep the touches for the next flush
+                # unless a newer one arrived
+                for session_id, last_activity in batch.items():
+                    self._pending.setdefault(session_id, last_activity)
+                raise
+            finally:
+                self._in_flight = {}
+
+    async def run_forever(self):
+        """
+        Background job started on FastAPI startup
+        """
+        while True:
+            await asyncio.sleep(self.interval)
+
+            try:
+                await self.flush()
+            except Exception as e:
+                print("SESSION ACTIVITY FLUSH ERROR:", e)
+
+
+class SessionSweeper:
+    """
+    Deletes expired, idle and (after the retention window) revoked sessions
+    in bounded batches, then lets the backend optimize (SQLite: PRAGMA
+    optimize, VACUUM every N sweeps).
+    """
+
+    def __init__(
+        self,
+        store,
+        buffer,
+        interval=SESSION_SWEEP_INTERVAL_SECONDS,
+        batch_size=SESSION_SWEEP_BATCH_SIZE,
+        vacuum_every=SESSION_VACUUM_EVERY_SWEEPS
+    ):
+        self._store = store
+        self._buffer = buffer
+        self.interval = interval
+        self.batch_size = batch_size
+        self.vacuum_every = vacuum_every
+        self._sweeps = 0
+
+    async def sweep(self) -> int:
+        # Buffered activity must reach the store before idle rows are judged
+        await self._buffer.flush()
+
+        now = datetime.utcnow()
+        revoked_before = now - timedelta(minutes=SESSION_REVOKED_RETENTION_MINUTES)
+        idle_before = now - timedelta(minutes=IDLE_TIMEOUT_MINUTES)
+
+        deleted = 0
+        while True:
+            count = await self._store.delete_stale_batch(
+                now, revoked_before, idle_before, self.batch_size
+            )
+            deleted += count
+
+            if count < self.batch_size:
+                break
+
+        self._sweeps += 1
+        await self._store.optimize(vacuum=self._sweeps % self.vacuum_every == 0)
+
+        return deleted
+
+    async def run_forever(self):
+        """
+        Background job started in the FastAPI lifespan
+        """
+        while True:
+            try:
+                await self.sweep()
+            except Exception as e:
+                print("SESSION SWEEP ERROR:", e)
+
+            await asyncio.sleep(self.interval)
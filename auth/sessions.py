@@ -0,0 +1,29 @@
+from auth.session_store import (
+    SESSION_BACKEND,
+    SessionStore,
+    ActivityBuffer,
+    SessionSweeper
+)
+
+
+def create_session_store(backend=SESSION_BACKEND) -> SessionStore:
+    if backend == "sqlite":
+        from auth.sqlite_session_store import SQLiteSessionStore
+        return SQLiteSessionStore()
+
+    if backend == "mongo":
+        from auth.mongo_session_store import MongoSessionStore
+        return MongoSessionStore()
+
+    if backend == "memory":
+        from auth.memory_session_store import MemorySessionStore
+        return MemorySessionStore()
+
+    raise ValueError(f"Unknown SESSION_BACKEND: {backend}")
+
+
+# Built here rather than in auth.session_store: the backend modules import
+# that one, so it must not import them back while loading
+session_store = create_session_store()
+activity_buffer = ActivityBuffer(session_store)
+session_sweeper = SessionSweeper(session_store, activity_buffer)
@@ -1,15 +1,44 @@
-from sqlalchemy import Column, String, DateTime, Boolean
+from sqlalchemy import Column, String, DateTime, Boolean, Index, inspect
 from sqlite_db import Base
 
 class Session(Base):
     __tablename__ = "sessions"
+    __table_args__ = (
+        # Covers the refresh lookup and per-client bulk revokes
+        Index("ix_sessions_refresh_lookup", "client_id", "refresh_jti", "revoked"),
+    )
 
     session_id = Column(String, primary_key=True, index=True)
-    client_id = Column(String, index=True)
+    client_id = Column(String)
     refresh_jti = Column(String, unique=True, index=True)
-    refresh_token = Column(String)
     device_info = Column(String)
     issued_at = Column(DateTime)
     expires_at = Column(DateTime)
     last_activity = Column(DateTime)
     revoked = Column(Boolean, default=False)
+    revoked_at = Column(DateTime, index=True)  # polled by auth.revocation
+
+
+def init_session_schema(bind):
+    """
+    Creates the table for new databases and brings existing ones up to date:
+    revoked_at is added, missing indexes are created, the client_id index
+    superseded by the composite one is dropped and the redundant
+    refresh_token column removed.
+    """
+    Base.metadata.create_all(bind=bind)
+
+    table = Session.__table__
+    columns = {c["name"] for c in inspect(bind).get_columns(table.name)}
+
+    with bind.begin() as conn:
+        if "revoked_at" not in columns:
+            conn.exec_driver_sql("ALTER TABLE sessions ADD COLUMN revoked_at DATETIME")
+
+        conn.exec_driver_sql("DROP INDEX IF EXISTS ix_sessions_client_id")
+
+        if "refresh_token" in columns:
+            conn.exec_driver_sql("ALTER TABLE sessions DROP COLUMN refresh_token")
+
+    for index in table.indexes:
+        index.create(bind=bind, checkfirst=True)
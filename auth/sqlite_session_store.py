@@ -0,0 +1,221 @@
+import asyncio
+from datetime import datetime
+from dataclasses import asdict
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import update, delete, select, func, case, or_, and_, bindparam
+from sqlite_db import SessionLocal, SQLITE_POOL_SIZE, engine
+from auth.sqlite_session_model import Session as SQLiteSession, init_session_schema
+from auth.session_store import SessionStore, SessionRecord
+
+
+def _to_record(row):
+    return SessionRecord(
+        session_id=row.session_id,
+        client_id=row.client_id,
+        refresh_jti=row.refresh_jti,
+        device_info=row.device_info,
+        issued_at=row.issued_at,
+        expires_at=row.expires_at,
+        last_activity=row.last_activity,
+        revoked=row.revoked,
+        revoked_at=row.revoked_at
+    )
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    SQLite (WAL) session store. Every call runs on a dedicated thread pool
+    (one thread per pooled connection) so the event loop never waits on
+    SQLite locks or fsync.
+    """
+
+    def __init__(self, session_factory=SessionLocal, bind=engine, workers=SQLITE_POOL_SIZE):
+        self._session_factory = session_factory
+        self._engine = bind
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix="session-store"
+        )
+
+    async def _run(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+
+    async def init(self):
+        await self._run(init_session_schema, self._engine)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+    # ==========================
+    # BLOCKING IMPLEMENTATIONS
+    # ==========================
+    def _create(self, record: SessionRecord):
+        with self._session_factory() as db:
+            db.add(SQLiteSession(**asdict(record)))
+            db.commit()
+
+    def _find_active(self, client_id, refresh_jti):
+        with self._session_factory() as db:
+            row = db.query(SQLiteSession).filter(
+                SQLiteSession.client_id == client_id,
+                SQLiteSession.refresh_jti == refresh_jti,
+                SQLiteSession.revoked == False
+            ).first()
+
+            return _to_record(row) if row else None
+
+    def _touch_many(self, activity):
+        stmt = (
+            update(SQLiteSession.__table__)
+            .where(SQLiteSession.__table__.c.session_id == bindparam("b_session_id"))
+            .values(last_activity=bindparam("b_last_activity"))
+        )
+
+        with self._session_factory() as db:
+            db.execute(stmt, [
+                {"b_session_id": session_id, "b_last_activity": last_activity}
+                for session_id, last_activity in activity.items()
+            ])
+            db.commit()
+
+    def _revoke(self, session_id):
+        with self._session_factory() as db:
+            db.query(SQLiteSession).filter(
+                SQLiteSession.session_id == session_id,
+                SQLiteSession.revoked == False
+            ).update(
+                {"revoked": True, "revoked_at": datetime.utcnow()},
+                synchronize_session=False
+            )
+            db.commit()
+
+    def _revoke_by_jti(self, refresh_jti):
+        with self._session_factory() as db:
+            db.query(SQLiteSession).filter(
+                SQLiteSession.refresh_jti == refresh_jti,
+                SQLiteSession.revoked == False
+            ).update(
+                {"revoked": True, "revoked_at": datetime.utcnow()},
+                synchronize_session=False
+            )
+            db.commit()
+
+    def _revoke_all(self, client_id, device_info):
+        table = SQLiteSession.__table__
+        stmt = update(table).where(
+            table.c.client_id == client_id,
+            table.c.revoked == False
+        )
+
+        if device_info is not None:
+            stmt = stmt.where(table.c.device_info == device_info)
+
+        with self._engine.begin() as conn:
+            return conn.execute(
+                stmt.values(revoked=True, revoked_at=datetime.utcnow())
+            ).rowcount
+
+    def _revoked_since(self, since):
+        table = SQLiteSession.__table__
+        stmt = select(table.c.session_id, table.c.revoked_at).where(
+            table.c.revoked_at >= since
+        )
+
+        with self._engine.connect() as conn:
+            return [tuple(row) for row in conn.execute(stmt)]
+
+    def _count(self):
+        with self._session_factory() as db:
+            return db.query(SQLiteSession).count()
+
+    def _stats_sync(self, now, idle_before):
+        table = SQLiteSession.__table__
+        expired = and_(
+            table.c.revoked == False,
+            or_(table.c.expires_at < now, table.c.last_activity < idle_before)
+        )
+
+        stmt = select(
+            func.count(),
+            func.sum(case((table.c.revoked == True, 1), else_=0)),
+            func.sum(case((expired, 1), else_=0))
+        ).select_from(table)
+
+        with self._engine.connect() as conn:
+            total, revoked, expired_count = conn.execute(stmt).one()
+
+        revoked = revoked or 0
+        expired_count = expired_count or 0
+
+        return {
+            "active": total - revoked - expired_count,
+            "revoked": revoked,
+            "expired": expired_count,
+            "total": total
+        }
+
+    def _delete_stale_batch(self, now, revoked_before, idle_before, batch_size):
+        table = SQLiteSession.__table__
+
+        stale_ids = select(table.c.session_id).where(
+            or_(
+                table.c.expires_at < now,
+                and_(
+                    table.c.revoked == True,
+                    func.coalesce(table.c.revoked_at, table.c.last_activity) < revoked_before
+                ),
+                and_(table.c.revoked == False, table.c.last_activity < idle_before)
+            )
+        ).limit(batch_size)
+
+        with self._engine.begin() as conn:
+            result = conn.execute(
+                delete(table).where(table.c.session_id.in_(stale_ids))
+            )
+
+        return result.rowcount
+
+    def _optimize(self, vacuum):
+        with self._engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.exec_driver_sql("PRAGMA optimize")
+            if vacuum:
+                conn.exec_driver_sql("VACUUM")
+
+    # ==========================
+    # ASYNC API
+    # ==========================
+    async def create(self, record: SessionRecord):
+        await self._run(self._create, record)
+
+    async def find_active(self, client_id, refresh_jti) -> SessionRecord | None:
+        return await self._run(self._find_active, client_id, refresh_jti)
+
+    async def touch_many(self, activity: dict):
+        await self._run(self._touch_many, activity)
+
+    async def revoke(self, session_id):
+        await self._run(self._revoke, session_id)
+
+    async def revoke_by_jti(self, refresh_jti):
+        await self._run(self._revoke_by_jti, refresh_jti)
+
+    async def revoke_all(self, client_id, device_info=None) -> int:
+        return await self._run(self._revoke_all, client_id, device_info)
+
+    async def revoked_since(self, since) -> list:
+        return await self._run(self._revoked_since, since)
+
+    async def count(self) -> int:
+        return await self._run(self._count)
+
+    async def _stats(self, now, idle_before) -> dict:
+        return await self._run(self._stats_sync, now, idle_before)
+
+    async def delete_stale_batch(self, now, revoked_before, idle_before, batch_size) -> int:
+        return await self._run(
+            self._delete_stale_batch, now, revoked_before, idle_before, batch_size
+        )
+
+    async def optimize(self, vacuum=False):
+        await self._run(self._optimize, vacuum)
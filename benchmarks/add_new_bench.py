@@ -0,0 +1,152 @@
+"""
+POST /add-new database write path: the original synchronous pymongo
+sequence (find / sorted find / insert / re-find per collection, run on
+the event loop) versus save_add_new_records (Motor upserts in one
+transaction).
+
+Reports round trips, latency and how long the event loop is blocked
+(a probe coroutine records how late its 5ms sleeps wake up).
+
+Writes go to a scratch database that is dropped afterwards.
+Usage (needs MONGO_URI; a replica set, or MONGO_TRANSACTIONS=false):
+    python -m benchmarks.add_new_bench --iterations 100
+"""
+import time
+import uuid
+import argparse
+import asyncio
+
+from benchmarks.bench_utils import install_command_counter, percentile, report
+
+counter = install_command_counter()
+
+from pymongo import MongoClient  # noqa: E402
+import database  # noqa: E402
+from routers.add_new import (  # noqa: E402
+    save_add_new_records,
+    build_client_doc,
+    build_industry_doc,
+    build_project_doc,
+    build_deliverable_doc
+)
+
+BENCH_DATABASE = "akin_bench_add_new"
+
+
+def legacy_next_number(collection, field):
+    last = collection.find_one({}, sort=[(field, -1)])
+    if last and field in last:
+        try:
+            return int(last[field].split("_")[1]) + 1
+        except (IndexError, ValueError):
+            pass
+    return 1
+
+
+def legacy_save(db, names):
+    # Pre-optimisation sequence, blocking calls on the event loop
+    if not db.clients.find_one({"email_id": names["email_id"]}):
+        number = legacy_next_number(db.clients, "client_code")
+        db.clients.insert_one(build_client_doc(
+            names["client_name"], names["email_id"], "hash", "client", "", number
+        ))
+
+    if not db.industries.find_one({"industry_name": names["industry_name"]}):
+        db.industries.insert_one(build_industry_doc(names["industry_name"]))
+    industry_id = db.industries.find_one({"industry_name": names["industry_name"]})["_id"]
+
+    if not db.projects_master.find_one({"project_name": names["project_name"]}):
+        number = legacy_next_number(db.projects_master, "project_code")
+        db.projects_master.insert_one(build_project_doc(
+            names["project_name"], "", "", industry_id, number
+        ))
+    project_id = db.projects_master.find_one({"project_name": names["project_name"]})["_id"]
+
+    if not db.deliverables.find_one({"deliverable_name": names["deliverable_name"]}):
+        number = legacy_next_number(db.deliverables, "deliverable_code")
+        db.deliverables.insert_one(build_deliverable_doc(
+            names["deliverable_name"], project_id, industry_id, number
+        ))
+
+
+async def current_save(names):
+    await save_add_new_records(
+        client_name=names["client_name"],
+        email_id=names["email_id"],
+        password_hash="hash",
+        role="client",
+        logo_url="",
+        industry_name=names["industry_name"],
+        project_name=names["project_name"],
+        location_name="",
+        location_url="",
+        deliverable_name=names["deliverable_name"]
+    )
+
+
+def new_names():
+    key = uuid.uuid4().hex[:12]
+    return {
+        "client_name": f"client-{key}",
+        "email_id": f"{key}@bench.local",
+        "industry_name": f"industry-{key}",
+        "project_name": f"project-{key}",
+        "deliverable_name": f"deliverable-{key}"
+    }
+
+
+async def probe(lags, stop):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.005)
+        lags.append((time.perf_counter() - start - 0.005) * 1000)
+
+
+async def run(label, save, iterations):
+    counter.reset()
+    await save(new_names())
+    trips = counter.count
+
+    lags, stop = [], asyncio.Event()
+    probe_task = asyncio.create_task(probe(lags, stop))
+    await asyncio.sleep(0)
+
+    samples = []
+    for _ in range(iterations):
+        names = new_names()
+        start = time.perf_counter()
+        await save(names)
+        samples.append((time.perf_counter() - start) * 1000)
+
+    stop.set()
+    await probe_task
+
+    report(label, samples, trips)
+    print(f"{'':<28} loop lag p99={percentile(lags, 99):8.2f}ms max={max(lags):8.2f}ms")
+
+
+async def main(iterations):
+    database.DATABASE_NAME = BENCH_DATABASE
+    await database.connect_to_mongo()
+
+    sync_client = MongoClient(database.MONGO_URI)
+    sync_db = sync_client[BENCH_DATABASE]
+
+    async def legacy(names):
+        legacy_save(sync_db, names)
+
+    try:
+        await run("legacy (sync pymongo)", legacy, iterations)
+        await run("motor upserts + txn", current_save, iterations)
+    finally:
+        sync_client.drop_database(BENCH_DATABASE)
+        sync_client.close()
+        await database.close_mongo_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=100)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.iterations))
@@ -0,0 +1,57 @@
+"""
+Per-request auth overhead of get_current_user: full JWT verification
+versus the decoded-token cache, at a simulated high request rate.
+
+Runs offline:
+    python -m benchmarks.auth_bench --requests 100000 --users 500
+"""
+import os
+import time
+import random
+import argparse
+import asyncio
+
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+
+from fastapi.security import HTTPAuthorizationCredentials  # noqa: E402
+from auth.auth_service import create_access_token  # noqa: E402
+from auth.dependencies import get_current_user, token_cache  # noqa: E402
+
+
+async def run(credentials, requests, use_cache):
+    start = time.perf_counter()
+
+    for _ in range(requests):
+        if not use_cache:
+            token_cache._entries.clear()
+        await get_current_user(random.choice(credentials))
+
+    elapsed = time.perf_counter() - start
+    return elapsed / requests * 1e6, requests / elapsed
+
+
+async def main(requests, users):
+    credentials = [
+        HTTPAuthorizationCredentials(
+            scheme="Bearer",
+            credentials=create_access_token({
+                "sub": f"client-{n}",
+                "username": f"user {n}",
+                "role": "user"
+            })
+        )
+        for n in range(users)
+    ]
+
+    for label, use_cache in (("verify every request", False), ("token cache", True)):
+        per_request_us, rps = await run(credentials, requests, use_cache)
+        print(f"{label:<22} {per_request_us:8.1f}us/request  {rps:10.0f} req/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=100000)
+    parser.add_argument("--users", type=int, default=500)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.requests, args.users))
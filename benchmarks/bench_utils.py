@@ -0,0 +1,74 @@
+import time
+from pymongo import monitoring
+
+
+class CommandCounter(monitoring.CommandListener):
+    """
+    Counts commands sent to MongoDB (one command = one round trip)
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def started(self, event):
+        self.count += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+    def reset(self):
+        self.count = 0
+
+
+def install_command_counter():
+    """
+    Must be called before the Mongo client is created
+    """
+    counter = CommandCounter()
+    monitoring.register(counter)
+    return counter
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def time_async(fn, iterations, warmup=5):
+    for _ in range(warmup):
+        await fn()
+
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    return samples
+
+
+def time_sync(fn, iterations, warmup=5):
+    for _ in range(warmup):
+        fn()
+
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    return samples
+
+
+def report(label, samples, round_trips=None):
+    line = (
+        f"{label:<28} p50={percentile(samples, 50):8.2f}ms "
+        f"p99={percentile(samples, 99):8.2f}ms"
+    )
+    if round_trips is not None:
+        line += f"  round_trips={round_trips}"
+    print(line)
@@ -0,0 +1,66 @@
+"""
+Dashboard summary benchmark: round trips and latency of the legacy
+sequential build versus the concurrent grouped build.
+
+Usage (needs MONGO_URI):
+    python -m benchmarks.dashboard_bench --iterations 200
+"""
+import argparse
+import asyncio
+
+from benchmarks.bench_utils import install_command_counter, time_async, report
+
+counter = install_command_counter()
+
+import database  # noqa: E402
+from services.dashboard_service import build_dashboard_response  # noqa: E402
+
+
+async def legacy_build_dashboard_response():
+    # Pre-optimisation query sequence: 3 finds + 6 count_documents, one after another
+    db = database.get_db()
+
+    await db["clients"].find(
+        {"status": "Active"}, {"_id": 0, "client_name": 1, "logo_path": 1}
+    ).to_list(length=None)
+    await db["industries"].find(
+        {}, {"_id": 0, "industry_code": 1, "industry_name": 1, "industry_image_url": 1}
+    ).to_list(length=None)
+    await db["projects_master"].find(
+        {"created_at": {"$exists": True}}
+    ).sort("created_at", -1).limit(3).to_list(length=3)
+
+    await db["clients"].count_documents({"status": "Active"})
+    await db["industries"].count_documents({})
+    await db["projects_master"].count_documents({})
+    await db["projects_master"].count_documents({"status": "Inprogress"})
+    await db["projects_master"].count_documents({"status": "Completed"})
+    await db["projects_master"].count_documents({"status": "Planning"})
+
+
+async def round_trips(fn):
+    counter.reset()
+    await fn()
+    return counter.count
+
+
+async def main(iterations):
+    await database.connect_to_mongo()
+
+    for label, fn in (
+        ("legacy (sequential)", legacy_build_dashboard_response),
+        ("grouped + concurrent", build_dashboard_response)
+    ):
+        trips = await round_trips(fn)
+        samples = await time_async(fn, iterations)
+        report(label, samples, trips)
+
+    await database.close_mongo_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.iterations))
@@ -0,0 +1,59 @@
+"""
+OTP mail delivery throughput and latency through MailQueue against the
+local stub HTTP server (no network, no Brevo account needed).
+
+    python -m benchmarks.mail_queue_bench --messages 2000 --delay-ms 50 --fail-rate 0.05
+"""
+import time
+import argparse
+import asyncio
+
+from benchmarks.bench_utils import percentile
+from benchmarks.stub_http_server import StubHTTPServer
+from auth.mail_queue import MailQueue
+
+
+async def main(messages, workers, delay_ms, fail_rate):
+    server = await StubHTTPServer(delay_ms=delay_ms, fail_rate=fail_rate).start()
+    queue = MailQueue(
+        server.url + "/v3/smtp/email",
+        workers=workers,
+        max_size=messages,
+        backoff_seconds=0.05
+    )
+    await queue.start()
+
+    start = time.perf_counter()
+    ids = [
+        queue.enqueue({"to": [{"email": f"user{n}@example.com"}]}, {"api-key": "stub"})
+        for n in range(messages)
+    ]
+    await queue.join()
+    elapsed = time.perf_counter() - start
+
+    statuses = [queue.status(i) for i in ids]
+    latencies = [
+        (s["sent_at"] - s["queued_at"]) * 1000
+        for s in statuses if s["status"] == "sent"
+    ]
+    failed = sum(1 for s in statuses if s["status"] == "failed")
+    retried = sum(1 for s in statuses if s["attempts"] > 1)
+
+    await queue.stop()
+    await server.stop()
+
+    print(f"{messages} messages, {workers} workers, stub delay {delay_ms}ms, fail rate {fail_rate:.0%}")
+    print(f"throughput {messages / elapsed:8.1f} msg/s  connections opened {server.connections}")
+    print(f"queue->sent p50={percentile(latencies, 50):.1f}ms p99={percentile(latencies, 99):.1f}ms")
+    print(f"retried {retried}  failed {failed}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--delay-ms", type=int, default=50)
+    parser.add_argument("--fail-rate", type=float, default=0.05)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.messages, args.workers, args.delay_ms, args.fail_rate))
@@ -0,0 +1,129 @@
+"""
+Project file uploads for one POST /add-new: the original sequential
+cloudinary.uploader.upload(await file.read()) on the event loop versus
+services.media_upload (streamed, concurrent, bounded executor).
+
+Cloudinary is replaced by the local stub HTTP server through the SDK's
+upload_prefix setting, so this runs offline. The stub runs on its own
+thread and loop (the sequential baseline blocks the benchmark loop).
+A probe coroutine measures how late the event loop wakes up while
+uploads run.
+
+    python -m benchmarks.media_upload_bench --files 20 --size-kb 512 --delay-ms 150
+"""
+import os
+import time
+import argparse
+import asyncio
+import threading
+from tempfile import SpooledTemporaryFile
+
+import cloudinary
+import cloudinary.uploader
+from fastapi import UploadFile
+
+from benchmarks.bench_utils import percentile
+from benchmarks.stub_http_server import StubHTTPServer
+from services import media_upload
+
+
+async def probe(lags, stop):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.005)
+        lags.append((time.perf_counter() - start - 0.005) * 1000)
+
+
+def make_uploads(count, size_kb):
+    uploads = []
+    for n in range(count):
+        spooled = SpooledTemporaryFile(max_size=1024 * 1024)
+        spooled.write(os.urandom(size_kb * 1024))
+        spooled.seek(0)
+        uploads.append(UploadFile(spooled, size=size_kb * 1024, filename=f"file{n}.bin"))
+    return uploads
+
+
+async def sequential(uploads):
+    # The original handler: whole file in memory, blocking call on the loop
+    for upload in uploads:
+        cloudinary.uploader.upload(
+            await upload.read(),
+            folder="add_new/projects/bench",
+            resource_type="auto"
+        )
+
+
+async def concurrent(uploads):
+    return await media_upload.upload_media(
+        uploads,
+        folder="add_new/projects/bench",
+        resource_type="auto"
+    )
+
+
+async def run(label, fn, uploads):
+    lags, stop = [], asyncio.Event()
+    probe_task = asyncio.create_task(probe(lags, stop))
+    await asyncio.sleep(0)  # let the probe start its first sleep
+
+    start = time.perf_counter()
+    result = await fn(uploads)
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await probe_task
+
+    print(
+        f"{label:<12} total={elapsed * 1000:8.1f}ms  "
+        f"loop lag p99={percentile(lags, 99):8.2f}ms max={max(lags):8.2f}ms"
+    )
+    return result
+
+
+def start_stub(delay_ms):
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+
+    server = StubHTTPServer(
+        delay_ms=delay_ms,
+        status=200,
+        respond=lambda method, path, body: {"secure_url": "https://stub/file", "bytes": len(body)}
+    )
+    asyncio.run_coroutine_threadsafe(server.start(), loop).result()
+    return server, loop
+
+
+async def main(files, size_kb, delay_ms):
+    server, stub_loop = start_stub(delay_ms)
+
+    cloudinary.config(
+        cloud_name="bench",
+        api_key="bench",
+        api_secret="bench",
+        upload_prefix=server.url
+    )
+
+    print(
+        f"{files} files x {size_kb}KB, stub delay {delay_ms}ms, "
+        f"per request {media_upload.MEDIA_UPLOADS_PER_REQUEST}, workers {media_upload.MEDIA_UPLOAD_WORKERS}"
+    )
+
+    await run("sequential", sequential, make_uploads(files, size_kb))
+    results = await run("concurrent", concurrent, make_uploads(files, size_kb))
+
+    per_file = [r["seconds"] * 1000 for r in results]
+    print(f"per-file     p50={percentile(per_file, 50):8.1f}ms p99={percentile(per_file, 99):8.1f}ms")
+    print(f"stub requests {server.requests}")
+
+    asyncio.run_coroutine_threadsafe(server.stop(), stub_loop).result()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=20)
+    parser.add_argument("--size-kb", type=int, default=512)
+    parser.add_argument("--delay-ms", type=int, default=150)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.files, args.size_kb, args.delay_ms))
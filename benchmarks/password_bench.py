@@ -0,0 +1,61 @@
+"""
+Login hashing throughput and event-loop responsiveness: bcrypt run inline
+on the loop versus offloaded to the bounded password executor.
+
+A probe coroutine stands in for other routes: it sleeps 5ms in a loop and
+records how late it wakes up while logins are saturating the hasher.
+
+Runs offline:
+    python -m benchmarks.password_bench --logins 64
+"""
+import time
+import argparse
+import asyncio
+
+from benchmarks.bench_utils import percentile
+from auth import passwords
+
+
+async def probe(lags, stop):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.005)
+        lags.append((time.perf_counter() - start - 0.005) * 1000)
+
+
+async def run(label, verify, hashed, logins):
+    lags, stop = [], asyncio.Event()
+    probe_task = asyncio.create_task(probe(lags, stop))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(verify("secret-password", hashed) for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await probe_task
+
+    print(
+        f"{label:<10} {logins / elapsed:7.1f} logins/s  "
+        f"loop lag p50={percentile(lags, 50):7.2f}ms p99={percentile(lags, 99):7.2f}ms max={max(lags):7.2f}ms"
+    )
+
+
+async def inline_verify(password, hashed):
+    passwords._verify(password, hashed)  # blocks the loop, as a sync check would
+    await asyncio.sleep(0)
+
+
+async def main(logins):
+    hashed = await passwords.hash_password("secret-password")
+
+    print(f"bcrypt rounds={passwords.PASSWORD_HASH_ROUNDS} workers={passwords.PASSWORD_HASH_WORKERS}")
+    await run("inline", inline_verify, hashed, logins)
+    await run("offloaded", passwords.verify_password, hashed, logins)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=64)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.logins))
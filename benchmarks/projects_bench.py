@@ -0,0 +1,107 @@
+"""
+Projects listing benchmark: $lookup + $dateToString pipeline versus a
+projected find with the in-process industry dictionary.
+
+Seeds a scratch database (BENCH_DATABASE_NAME, default "akin_bench")
+with 40 industries and N projects, then drops it.
+
+Usage (needs MONGO_URI):
+    python -m benchmarks.projects_bench --sizes 10000 100000
+"""
+import os
+import argparse
+import asyncio
+import random
+from datetime import datetime, timedelta
+
+os.environ["DATABASE_NAME"] = os.getenv("BENCH_DATABASE_NAME", "akin_bench")
+
+from benchmarks.bench_utils import time_async, report  # noqa: E402
+import database  # noqa: E402
+from routers.projects import list_projects  # noqa: E402
+from services.name_maps import industry_names  # noqa: E402
+
+INDUSTRY_COUNT = 40
+BATCH = 5000
+
+
+async def legacy_get_projects():
+    cols = database.get_collections()
+
+    pipeline = [
+        {"$lookup": {
+            "from": "industries",
+            "localField": "industry_id",
+            "foreignField": "_id",
+            "as": "industry_info"
+        }},
+        {"$unwind": {"path": "$industry_info", "preserveNullAndEmptyArrays": True}},
+        {"$project": {
+            "_id": 0,
+            "project_code": 1,
+            "project_name": 1,
+            "industry_name": "$industry_info.industry_name",
+            "location_name": 1,
+            "status": 1,
+            "image_url": {"$ifNull": ["$project_image_path", ""]},
+            "created_at": {"$dateToString": {"format": "%d-%m-%Y %H:%M", "date": "$created_at"}},
+            "updated_at": {"$dateToString": {"format": "%d-%m-%Y %H:%M", "date": "$updated_at"}}
+        }}
+    ]
+
+    return await cols["projects_master"].aggregate(pipeline).to_list(None)
+
+
+async def seed(size):
+    cols = database.get_collections()
+    await cols["industries"].delete_many({})
+    await cols["projects_master"].delete_many({})
+
+    industries = [
+        {"industry_code": f"I{i:02d}", "industry_name": f"Industry {i}"}
+        for i in range(INDUSTRY_COUNT)
+    ]
+    await cols["industries"].insert_many(industries)
+    industry_ids = [i["_id"] for i in industries]
+
+    now = datetime.utcnow()
+    for start in range(0, size, BATCH):
+        await cols["projects_master"].insert_many([
+            {
+                "project_code": f"PRJ_{n}",
+                "project_name": f"Project {n}",
+                "project_image_path": "",
+                "location_name": "Site",
+                "industry_id": random.choice(industry_ids),
+                "status": random.choice(["Planning", "Inprogress", "Completed"]),
+                "created_at": now - timedelta(minutes=n),
+                "updated_at": now
+            }
+            for n in range(start, min(size, start + BATCH))
+        ])
+
+    industry_names.invalidate()
+
+
+async def main(sizes, iterations):
+    await database.connect_to_mongo()
+
+    try:
+        for size in sizes:
+            await seed(size)
+            print(f"--- {size} projects")
+
+            report("$lookup pipeline", await time_async(legacy_get_projects, iterations, warmup=2))
+            report("find + industry dictionary", await time_async(list_projects, iterations, warmup=2))
+    finally:
+        await database.get_db().client.drop_database(database.DATABASE_NAME)
+        await database.close_mongo_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.sizes, args.iterations))
@@ -0,0 +1,98 @@
+"""
+Response encoding micro-benchmark on large report / analytics documents:
+jsonable_encoder + JSONResponse versus MongoJSONResponse.
+
+Runs offline:
+    python -m benchmarks.serializer_bench --sections 500
+"""
+import argparse
+from datetime import datetime
+from bson import ObjectId, Binary
+from bson.decimal128 import Decimal128
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from benchmarks.bench_utils import time_sync, report
+from utils.mongo_serializer import MongoJSONResponse
+
+LEGACY_ENCODERS = {
+    ObjectId: str,
+    Decimal128: lambda v: float(v.to_decimal()),
+    Binary: lambda v: bytes(v).hex()
+}
+
+
+def make_report(sections):
+    return {
+        "_id": ObjectId(),
+        "industry_id": ObjectId(),
+        "project_id": ObjectId(),
+        "deliverable_id": ObjectId(),
+        "client_id": ObjectId(),
+        "version": 3,
+        "created_at": datetime.utcnow(),
+        "sections": [
+            {
+                "section_id": ObjectId(),
+                "title": f"Section {n}",
+                "updated_at": datetime.utcnow(),
+                "findings": [
+                    {
+                        "finding_id": ObjectId(),
+                        "score": Decimal128(f"{n}.{k}"),
+                        "observed_at": datetime.utcnow(),
+                        "text": "Observation " * 8
+                    }
+                    for k in range(10)
+                ],
+                "thumbnail": Binary(b"\x89PNG" * 16)
+            }
+            for n in range(sections)
+        ]
+    }
+
+
+def make_analytics(sections):
+    return {
+        "_id": ObjectId(),
+        "report_id": ObjectId(),
+        "generated_at": datetime.utcnow(),
+        "series": [
+            {
+                "metric_id": ObjectId(),
+                "points": [
+                    {"t": datetime.utcnow(), "v": Decimal128(f"{n}.{k}")}
+                    for k in range(50)
+                ]
+            }
+            for n in range(sections)
+        ]
+    }
+
+
+def legacy(doc):
+    return JSONResponse(jsonable_encoder(doc, custom_encoder=LEGACY_ENCODERS)).body
+
+
+def current(doc):
+    return MongoJSONResponse(doc).body
+
+
+def main(sections, iterations):
+    for label, doc in (
+        ("report", make_report(sections)),
+        ("analytics", make_analytics(sections))
+    ):
+        size = len(current(doc))
+        print(f"--- {label} document ({size / 1024:.0f} KiB encoded)")
+        report("jsonable_encoder", time_sync(lambda: legacy(doc), iterations))
+        report("MongoJSONResponse", time_sync(lambda: current(doc), iterations))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sections", type=int, default=500)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    main(args.sections, args.iterations)
@@ -0,0 +1,116 @@
+"""
+Refresh lookup latency against a sessions table with a million rows:
+the original schema (single-column indexes, refresh_token copy) versus
+the current one (composite refresh index, no token copy).
+
+Runs offline against temporary SQLite files:
+    python -m benchmarks.session_refresh_bench --rows 1000000
+"""
+import os
+import uuid
+import random
+import sqlite3
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine
+
+from benchmarks.bench_utils import time_sync, report
+from auth.sqlite_session_model import Session, init_session_schema
+
+LEGACY_SCHEMA = """
+CREATE TABLE sessions (
+    session_id VARCHAR NOT NULL,
+    client_id VARCHAR,
+    refresh_jti VARCHAR,
+    refresh_token VARCHAR,
+    device_info VARCHAR,
+    issued_at DATETIME,
+    expires_at DATETIME,
+    last_activity DATETIME,
+    revoked BOOLEAN,
+    PRIMARY KEY (session_id)
+);
+CREATE INDEX ix_sessions_client_id ON sessions (client_id);
+CREATE UNIQUE INDEX ix_sessions_refresh_jti ON sessions (refresh_jti);
+CREATE INDEX ix_sessions_session_id ON sessions (session_id);
+"""
+
+REFRESH_LOOKUP = (
+    "SELECT * FROM sessions "
+    "WHERE client_id = ? AND refresh_jti = ? AND revoked = 0 LIMIT 1"
+)
+
+FAKE_TOKEN = "e" * 360  # typical HS256 refresh token length
+BATCH = 50000
+
+
+def seed(path, rows, legacy):
+    if legacy:
+        conn = sqlite3.connect(path)
+        conn.executescript(LEGACY_SCHEMA)
+    else:
+        init_session_schema(create_engine(f"sqlite:///{path}"))
+        conn = sqlite3.connect(path)
+
+    columns = [c.name for c in Session.__table__.columns]
+    if legacy:
+        columns.insert(3, "refresh_token")
+
+    insert = f"INSERT INTO sessions ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+
+    now = datetime.utcnow()
+    keys = []
+    for start in range(0, rows, BATCH):
+        batch = []
+        for _ in range(start, min(rows, start + BATCH)):
+            row = [
+                str(uuid.uuid4()),
+                f"client-{random.randrange(rows // 20 or 1)}",
+                str(uuid.uuid4()),
+                "web",
+                now,
+                now + timedelta(days=15),
+                now,
+                random.random() < 0.3
+            ]
+            if legacy:
+                row.insert(3, FAKE_TOKEN)
+            batch.append(row)
+            if len(keys) < 10000:
+                keys.append((row[1], row[2]))
+        conn.executemany(insert, batch)
+        conn.commit()
+
+    conn.execute("ANALYZE")
+    conn.close()
+    return keys
+
+
+def main(rows, iterations):
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, legacy in (("single-column indexes", True), ("composite index", False)):
+            path = os.path.join(tmp, f"{'legacy' if legacy else 'current'}.sqlite3")
+            keys = seed(path, rows, legacy)
+
+            conn = sqlite3.connect(path)
+            conn.execute("PRAGMA journal_mode=WAL")
+            plan = conn.execute("EXPLAIN QUERY PLAN " + REFRESH_LOOKUP, keys[0]).fetchall()
+
+            samples = time_sync(
+                lambda: conn.execute(REFRESH_LOOKUP, random.choice(keys)).fetchone(),
+                iterations
+            )
+            conn.close()
+
+            print(f"--- {label}: {os.path.getsize(path) / 2**20:.0f} MiB, plan: {plan[-1][-1]}")
+            report("refresh lookup", samples)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    main(args.rows, args.iterations)
@@ -0,0 +1,101 @@
+"""
+Minimal keep-alive HTTP/1.1 stub for offline benchmarks of outbound
+integrations (Brevo mail API, Cloudinary uploads).
+
+Every request is answered after `delay_ms` with `status` and a JSON body
+from `respond(method, path, body)`. `fail_rate` turns that share of
+requests into 503s to exercise retries.
+
+Standalone:
+    python -m benchmarks.stub_http_server --port 8025 --delay-ms 50
+"""
+import json
+import random
+import argparse
+import asyncio
+
+
+class StubHTTPServer:
+
+    def __init__(self, host="127.0.0.1", port=0, delay_ms=0, status=201, fail_rate=0.0, respond=None):
+        self.host = host
+        self.port = port
+        self.delay_ms = delay_ms
+        self.status = status
+        self.fail_rate = fail_rate
+        self.respond = respond or (lambda method, path, body: {"messageId": "stub"})
+        self.requests = 0
+        self.connections = 0
+        self._server = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+
+                method, path, _ = request_line.decode().split(" ", 2)
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode().partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                self.requests += 1
+
+                if self.delay_ms:
+                    await asyncio.sleep(self.delay_ms / 1000)
+
+                if random.random() < self.fail_rate:
+                    status, payload = 503, {"message": "stub failure"}
+                else:
+                    status, payload = self.status, self.respond(method, path, body)
+
+                data = json.dumps(payload).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} STUB\r\n"
+                    "Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    "Connection: keep-alive\r\n\r\n".encode() + data
+                )
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def main(port, delay_ms, status, fail_rate):
+    server = await StubHTTPServer(port=port, delay_ms=delay_ms, status=status, fail_rate=fail_rate).start()
+    print(f"Stub listening on {server.url}")
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8025)
+    parser.add_argument("--delay-ms", type=int, default=50)
+    parser.add_argument("--status", type=int, default=201)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.port, args.delay_ms, args.status, args.fail_rate))
@@ -1,6 +1,11 @@
 import os
+import sys
+import asyncio
+from datetime import datetime
+from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorClient
-from pymongo import MongoClient
+from pymongo import IndexModel, ASCENDING, DESCENDING
+from pymongo.errors import OperationFailure
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -8,9 +13,12 @@ load_dotenv()
 MONGO_URI = os.getenv("MONGO_URI")
 DATABASE_NAME = os.getenv("DATABASE_NAME", "akin_platform_db")
 
-client = MongoClient(MONGO_URI)
+# Multi-document transactions need a replica set; set to "false" for a
+# standalone mongod in local development
+MONGO_TRANSACTIONS = os.getenv("MONGO_TRANSACTIONS", "true").lower() == "true"
 
-db = client["akin_platform_db"]
+client = None
+db = None
 
 # Mongo Connection
 async def connect_to_mongo():
@@ -45,6 +53,16 @@ async def close_mongo_connection():
 
 
 # Helper functions
+def get_client():
+    """
+    Motor client, for sessions and transactions
+    """
+    if client is None:
+        raise Exception(" Database not initialized. Did you call connect_to_mongo()?")
+
+    return client
+
+
 def get_db():
     """
     Safe DB getter
@@ -55,6 +73,19 @@ def get_db():
     return db
 
 
+async def run_in_transaction(callback):
+    """
+    Awaits callback(session) inside a transaction; with_transaction retries
+    it on transient errors, so the callback must be safe to re-run.
+    Without MONGO_TRANSACTIONS the callback runs once with session=None.
+    """
+    if not MONGO_TRANSACTIONS:
+        return await callback(None)
+
+    async with await get_client().start_session() as session:
+        return await session.with_transaction(callback)
+
+
 def get_collections():
     db_instance = get_db()  # ✅ Always get DB safely
 
@@ -69,5 +100,271 @@ def get_collections():
         "notifications": db_instance["notifications"],  # ✅ FIXED
         "dashboard": db_instance["dashboard"],
         "deliverables": db_instance["deliverables"],
-        "sessions_col": db_instance["sessions"]
+        "sessions_col": db_instance["sessions"],
+        "counters": db_instance["counters"]
     }
+
+
+# ======================================================
+# INDEX REGISTRY → applied on startup by ensure_indexes()
+# ======================================================
+INDEXES = {
+    "reports": [
+        IndexModel(
+            [
+                ("industry_id", ASCENDING),
+                ("project_id", ASCENDING),
+                ("deliverable_id", ASCENDING),
+                ("version", ASCENDING),
+                ("client_id", ASCENDING)
+            ],
+            name="reports_filters"
+        ),
+        IndexModel(
+            [
+                ("deliverable_id", ASCENDING),
+                ("version", ASCENDING),
+                ("client_id", ASCENDING)
+            ],
+            name="reports_deliverable_version"
+        )
+    ],
+    "analytics": [
+        IndexModel([("report_id", ASCENDING)], name="analytics_report_id")
+    ],
+    "projects_master": [
+        IndexModel([("industry_id", ASCENDING)], name="projects_industry_id"),
+        IndexModel([("project_name", ASCENDING)], name="projects_project_name_unique", unique=True),
+        IndexModel([("created_at", DESCENDING)], name="projects_created_at")
+    ],
+    "deliverables": [
+        IndexModel([("project_id", ASCENDING)], name="deliverables_project_id"),
+        IndexModel([("deliverable_name", ASCENDING)], name="deliverables_name_unique", unique=True)
+    ],
+    "clients": [
+        # Also serves the login lookup on email_id + status
+        IndexModel([("email_id", ASCENDING)], name="clients_email_id_unique", unique=True)
+    ],
+    "industries": [
+        IndexModel([("industry_name", ASCENDING)], name="industries_name_unique", unique=True)
+    ],
+    "notifications": [
+        IndexModel(
+            [("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="notifications_feed"
+        )
+    ],
+    "alerts": [
+        IndexModel(
+            [("issued_datetime", DESCENDING), ("_id", DESCENDING)],
+            name="alerts_feed"
+        ),
+        # Filtered feeds: equality fields first, then the full (issued_datetime,
+        # _id) sort, so the page is read in order and the scan stops at limit
+        IndexModel(
+            [
+                ("status", ASCENDING),
+                ("severity", ASCENDING),
+                ("issued_datetime", DESCENDING),
+                ("_id", DESCENDING)
+            ],
+            name="alerts_status_severity_feed"
+        ),
+        IndexModel(
+            [("status", ASCENDING), ("issued_datetime", DESCENDING), ("_id", DESCENDING)],
+            name="alerts_status_feed"
+        ),
+        IndexModel(
+            [("severity", ASCENDING), ("issued_datetime", DESCENDING), ("_id", DESCENDING)],
+            name="alerts_severity_feed"
+        )
+    ],
+    # Used when SESSION_BACKEND=mongo; expired sessions are removed by the TTL monitor
+    "sessions": [
+        IndexModel([("refresh_jti", ASCENDING)], name="sessions_refresh_jti", unique=True),
+        IndexModel(
+            [("client_id", ASCENDING), ("refresh_jti", ASCENDING), ("revoked", ASCENDING)],
+            name="sessions_refresh_lookup"
+        ),
+        IndexModel([("last_activity", ASCENDING)], name="sessions_last_activity"),
+        IndexModel([("revoked_at", ASCENDING)], name="sessions_revoked_at"),
+        IndexModel([("expires_at", ASCENDING)], name="sessions_expires_at_ttl", expireAfterSeconds=0)
+    ]
+}
+
+# Sort orders of the feed queries, imported by the routers so QUERY_SHAPES
+# explains exactly the sorts the app sends
+NOTIFICATIONS_SORT = [("created_at", DESCENDING), ("_id", DESCENDING)]
+ALERTS_SORT = [("issued_datetime", DESCENDING), ("_id", DESCENDING)]
+RECENT_PROJECTS_SORT = [("created_at", DESCENDING)]
+
+# Hot query shapes as (collection, filter, sort). Each one must be served
+# by an index from INDEXES; check_query_shapes() fails on a COLLSCAN, and
+# on an in-memory SORT for shapes with a sort.
+QUERY_SHAPES = [
+    (
+        "reports",
+        {
+            "industry_id": ObjectId(),
+            "project_id": ObjectId(),
+            "deliverable_id": ObjectId(),
+            "version": 1,
+            "client_id": ObjectId()
+        },
+        None
+    ),
+    (
+        "reports",
+        {
+            "$or": [
+                {"deliverable_id": ObjectId(), "version": 1},
+                {"deliverable_id": ObjectId(), "version": 2}
+            ],
+            "client_id": ObjectId()
+        },
+        None
+    ),
+    ("analytics", {"report_id": ObjectId()}, None),
+    ("projects_master", {"industry_id": ObjectId()}, None),
+    ("projects_master", {"project_name": ""}, None),
+    ("projects_master", {"created_at": {"$exists": True}}, RECENT_PROJECTS_SORT),
+    ("deliverables", {"project_id": ObjectId()}, None),
+    ("deliverables", {"deliverable_name": ""}, None),
+    ("clients", {"email_id": "", "status": "Active"}, None),
+    ("clients", {"email_id": ""}, None),
+    ("industries", {"industry_name": ""}, None),
+    # First pages carry keyset_filter's $type check on the sort field
+    ("notifications", {"created_at": {"$type": "date"}}, NOTIFICATIONS_SORT),
+    ("alerts", {"issued_datetime": {"$type": "date"}}, ALERTS_SORT),
+    (
+        "alerts",
+        {"issued_datetime": {"$type": "date"}, "status": "Open", "severity": "High"},
+        ALERTS_SORT
+    ),
+    ("alerts", {"issued_datetime": {"$type": "date"}, "status": "Open"}, ALERTS_SORT),
+    ("alerts", {"issued_datetime": {"$type": "date"}, "severity": "High"}, ALERTS_SORT),
+    ("sessions", {"client_id": "", "refresh_jti": "", "revoked": False}, None),
+    ("sessions", {"client_id": "", "revoked": False}, None),
+    ("sessions", {"revoked_at": {"$gte": datetime.utcnow()}}, None)
+]
+
+
+# Indexes that supersede an older one, mapped to the name they replace.
+# Mongo allows one index per key pattern, so an old index on the same keys
+# is dropped first and restored if the new build fails (for the unique
+# add-new indexes: duplicates already stored have to be merged by hand);
+# an old index on other keys is dropped once the new one exists.
+REPLACED_INDEXES = {
+    "alerts_status_severity_feed": "alerts_status_severity",
+    "clients_email_id_unique": "clients_email_status",
+    "industries_name_unique": "industries_name",
+    "projects_project_name_unique": "projects_project_name",
+    "deliverables_name_unique": "deliverables_name"
+}
+
+
+async def _create_index(collection, index, existing):
+    name = index.document["name"]
+    old_name = REPLACED_INDEXES.get(name)
+    old = existing.get(old_name)
+    same_keys = old is not None and old["key"] == list(index.document["key"].items())
+
+    if same_keys:
+        await collection.drop_index(old_name)
+
+    try:
+        await collection.create_indexes([index])
+    except OperationFailure as e:
+        print(f" Index creation failed on {collection.name}.{name}: {e}")
+        if same_keys:
+            await collection.create_index(old["key"], name=old_name)
+        return
+
+    if old is not None and not same_keys:
+        await collection.drop_index(old_name)
+
+
+async def ensure_indexes():
+    """
+    Called on FastAPI startup. Indexes that already exist are skipped; the
+    rest are built one by one so a failure only affects that index.
+    """
+    db_instance = get_db()
+
+    for collection, indexes in INDEXES.items():
+        col = db_instance[collection]
+
+        try:
+            existing = await col.index_information()
+        except OperationFailure as e:
+            print(f" Index listing failed on {collection}: {e}")
+            continue
+
+        for index in indexes:
+            if index.document["name"] in existing:
+                continue
+            try:
+                await _create_index(col, index, existing)
+            except OperationFailure as e:
+                print(f" Index replacement failed on {collection}: {e}")
+
+
+def _plan_stages(plan):
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            yield plan["stage"]
+        for value in plan.values():
+            yield from _plan_stages(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            yield from _plan_stages(item)
+
+
+async def check_query_shapes():
+    """
+    Runs explain() on every registered query shape. Returns
+    (collection, filter, sort, stage) for each shape whose winning plan is
+    a collection scan, or sorts in memory although the shape has a sort.
+    """
+    db_instance = get_db()
+    failures = []
+
+    for collection, query, sort in QUERY_SHAPES:
+        cursor = db_instance[collection].find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+
+        explain = await cursor.explain()
+        winning_plan = explain["queryPlanner"]["winningPlan"]
+
+        stages = set(_plan_stages(winning_plan))
+
+        if "COLLSCAN" in stages:
+            failures.append((collection, query, sort, "COLLSCAN"))
+        elif sort and "SORT" in stages:
+            failures.append((collection, query, sort, "SORT"))
+
+    return failures
+
+
+async def _main(argv):
+    await connect_to_mongo()
+
+    try:
+        if "--apply" in argv:
+            await ensure_indexes()
+
+        failures = await check_query_shapes()
+    finally:
+        await close_mongo_connection()
+
+    for collection, query, sort, stage in failures:
+        print(f" {stage}: {collection} filter={list(query)} sort={sort}")
+
+    print(f" {len(QUERY_SHAPES) - len(failures)}/{len(QUERY_SHAPES)} query shapes use an index")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    # python database.py [--apply] → explain every registered query shape
+    sys.exit(asyncio.run(_main(sys.argv[1:])))
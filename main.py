@@ -1,22 +1,57 @@
 import os
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 from routers import dashboard
-from database import connect_to_mongo, close_mongo_connection
+from database import connect_to_mongo, close_mongo_connection, ensure_indexes
+from services.dashboard_service import reconcile_dashboard_forever
+from services.counters import seed_counters
+from services.add_new_store import add_new_store
 from auth.auth_routes import router as auth_router
 from routers import add_new
-from sqlite_db import engine
-from auth.sqlite_session_model import Base
-
-Base.metadata.create_all(bind=engine)
+from auth.sessions import session_store, activity_buffer, session_sweeper
+from auth.otp_service import mail_queue
+from auth.revocation import revocations
 
 # Import routers
 from routers import dashboard, reports, analytics, projects, alerts, admins
 
 import cloudinary
 
-app = FastAPI(title="AKIN WEB API")
+
+# App lifecycle: Mongo, indexes, session store and background jobs
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await connect_to_mongo()
+    await ensure_indexes()
+    await seed_counters()
+    await session_store.init()
+    await revocations.sync()
+    await mail_queue.start()
+
+    background_jobs = [
+        asyncio.create_task(reconcile_dashboard_forever()),
+        asyncio.create_task(activity_buffer.run_forever()),
+        asyncio.create_task(session_sweeper.run_forever()),
+        asyncio.create_task(revocations.run_forever())
+    ]
+
+    yield
+
+    for job in background_jobs:
+        job.cancel()
+    await asyncio.gather(*background_jobs, return_exceptions=True)
+
+    await activity_buffer.flush()
+    await add_new_store.snapshot()
+    await mail_queue.stop()
+    await close_mongo_connection()
+    session_store.shutdown()
+
+
+app = FastAPI(title="AKIN WEB API", lifespan=lifespan)
 
 load_dotenv()
 
@@ -35,17 +70,9 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
-# Mongo lifecycle
-@app.on_event("startup")
-async def startup():
-    await connect_to_mongo()
-
-@app.on_event("shutdown")
-async def shutdown():
-    await close_mongo_connection()
-
 # Include Routers
 app.include_router(auth_router)
 app.include_router(dashboard.router)
@@ -1,14 +1,38 @@
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException
-from database import db
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Request, Depends
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from database import get_db, run_in_transaction
+from services.dashboard_service import (
+    record_client_added,
+    record_client_updated,
+    record_industry_added,
+    record_project_added
+)
+from services.name_maps import client_names, industry_names
+from services.catalog import catalog
+from services.counters import client_codes, project_codes, deliverable_codes
+from utils.response_cache import cached_json_response, bump_version
+from auth.passwords import hash_password
+from auth.profile_cache import profile_cache
+from services.media_upload import upload_media, request_upload_slots
+from services.add_new_store import add_new_store, ADD_NEW_SOURCES
+from services.bulk_import import start_bulk_import, get_bulk_job, detect_format
+from routers.admins import require_super_admin
+from services.add_new_docs import (
+    build_client_doc,
+    build_industry_doc,
+    build_project_doc,
+    build_deliverable_doc
+)
 import cloudinary
-import cloudinary.uploader
-import json
-import os
+import asyncio
 from datetime import datetime
 
 router = APIRouter()
 
-DATA_FILE = "data/add_new_data.json"
+# Re-runs of the add-new write after losing an insert race on a unique name
+ADD_NEW_DUPLICATE_RETRIES = 3
 
 # ==============================
 # Cloudinary Config
@@ -20,105 +44,155 @@ cloudinary.config(
 )
 
 # ==============================
-# Helper Builders
+# Write Path (Motor, one transaction)
 # ==============================
 
-def build_client_doc(client_name, email_id, password, role, logo_url, number):
-    return {
-        "client_code": f"C_{number}",
+async def save_add_new_records(
+    *,
+    client_name,
+    email_id,
+    password_hash,
+    role,
+    logo_url,
+    industry_name,
+    project_name,
+    location_name,
+    location_url,
+    deliverable_name
+):
+    """
+    Client, industry, project and deliverable as four idempotent
+    find_one_and_update upserts in one transaction. Each returns the
+    document as it was before the write: None means it was inserted with
+    the _id generated here, otherwise the existing _id is reused.
+    Dashboard and caches are updated after the commit.
+    """
+    db = get_db()
+
+    # Allocated up front from the in-process blocks; a number drawn for a
+    # record that already exists is simply skipped
+    client_number = await client_codes.next()
+    project_number = await project_codes.next()
+    deliverable_number = await deliverable_codes.next()
+
+    client_doc = build_client_doc(
+        client_name, email_id, password_hash, role, logo_url, client_number
+    )
+    client_doc["_id"] = ObjectId()
+
+    client_updates = {
         "client_name": client_name,
-        "email_id": email_id,
-        "password": password,
+        "password": password_hash,
         "role": role,
-        "status": "Active",
         "logo_path": logo_url,
-        "created_at": datetime.utcnow(),
-        "updated_at": datetime.utcnow()
-    }
-
-
-def build_industry_doc(industry_name):
-    return {
-        "industry_code": industry_name[:3].upper(),
-        "industry_name": industry_name,
-        "industry_image_url": "",
-        "created_at": datetime.utcnow(),
         "updated_at": datetime.utcnow()
     }
+    client_inserts = {k: v for k, v in client_doc.items() if k not in client_updates}
 
+    industry_doc = build_industry_doc(industry_name)
+    industry_doc["_id"] = ObjectId()
 
-def build_project_doc(project_name, location_name, location_url, industry_id, number):
-    return {
-        "project_code": f"PRJ_{number}",
-        "project_name": project_name,
-        "project_image_path": "",
-        "location_name": location_name,
-        "location_url": location_url,
-        "industry_id": industry_id,
-        "status": "Planning",
-        "created_at": datetime.utcnow(),
-        "updated_at": datetime.utcnow()
-    }
+    async def write(session):
+        # -------- CLIENT (EMAIL UNIQUE) --------
+        old_client = await db.clients.find_one_and_update(
+            {"email_id": email_id},
+            {"$set": client_updates, "$setOnInsert": client_inserts},
+            projection={"_id": 1, "client_name": 1},
+            upsert=True,
+            return_document=ReturnDocument.BEFORE,
+            session=session
+        )
 
+        # -------- INDUSTRY --------
+        old_industry = await db.industries.find_one_and_update(
+            {"industry_name": industry_name},
+            {"$setOnInsert": industry_doc},
+            projection={"_id": 1},
+            upsert=True,
+            return_document=ReturnDocument.BEFORE,
+            session=session
+        )
+        industry_id = old_industry["_id"] if old_industry else industry_doc["_id"]
 
-def build_deliverable_doc(deliverable_name, project_id, industry_id, number):
-    return {
-        "deliverable_code": f"DEL_{number}",
-        "deliverable_name": deliverable_name,
-        "project_id": project_id,
-        "industry_id": industry_id,
-        "created_at": datetime.utcnow(),
-        "updated_at": datetime.utcnow()
-    }
+        # -------- PROJECT MASTER --------
+        project_doc = build_project_doc(
+            project_name, location_name, location_url, industry_id, project_number
+        )
+        project_doc["_id"] = ObjectId()
+
+        old_project = await db.projects_master.find_one_and_update(
+            {"project_name": project_name},
+            {"$setOnInsert": project_doc},
+            projection={"_id": 1},
+            upsert=True,
+            return_document=ReturnDocument.BEFORE,
+            session=session
+        )
+        project_id = old_project["_id"] if old_project else project_doc["_id"]
 
-# ==============================
-# Create JSON from DB
-# ==============================
+        # -------- DELIVERABLE --------
+        deliverable_doc = build_deliverable_doc(
+            deliverable_name, project_id, industry_id, deliverable_number
+        )
+        deliverable_doc["_id"] = ObjectId()
+
+        await db.deliverables.find_one_and_update(
+            {"deliverable_name": deliverable_name},
+            {"$setOnInsert": deliverable_doc},
+            projection={"_id": 1},
+            upsert=True,
+            session=session
+        )
 
-def create_json_from_db():
-    clients = list(db.clients.find({}, {"_id": 0, "client_name": 1}))
-    industries = list(db.industries.find({}, {"_id": 0, "industry_name": 1}))
-    deliverables = list(db.deliverables.find({}, {"_id": 0, "deliverable_name": 1}))
-    projects_master = list(db.projects_master.find(
-        {},
-        {
-            "_id": 0,
-            "project_name": 1,
-            "location_name": 1,
-            "location_url": 1
-        }
-    ))
-
-    formatted_data = {
-        "clients": [c["client_name"] for c in clients],
-        "industries": [i["industry_name"] for i in industries],
-        "deliverables": [d["deliverable_name"] for d in deliverables],
-        "projects_master": projects_master,
-        "projects": []
-    }
+        return old_client, old_industry, project_doc if old_project is None else None
+
+    for attempt in range(ADD_NEW_DUPLICATE_RETRIES + 1):
+        try:
+            old_client, old_industry, new_project = await run_in_transaction(write)
+            break
+        except DuplicateKeyError:
+            # A concurrent request inserted the same email / name first;
+            # on the next run the upsert matches its document
+            if attempt == ADD_NEW_DUPLICATE_RETRIES:
+                raise
+
+    if old_client is None:
+        await record_client_added(client_doc)
+    else:
+        client_names.invalidate(old_client["_id"])
+        profile_cache.invalidate(client_id=old_client["_id"], email_id=email_id)
+        await record_client_updated(
+            old_client.get("client_name"),
+            {"client_name": client_name, "logo_path": logo_url}
+        )
 
-    os.makedirs("data", exist_ok=True)
+    if old_industry is None:
+        industry_names.invalidate()
+        await record_industry_added(industry_doc)
 
-    with open(DATA_FILE, "w") as f:
-        json.dump(formatted_data, f, indent=4)
+    if new_project is not None:
+        await record_project_added(new_project)
 
 # ==============================
 # GET ADD-NEW
 # ==============================
 
-@router.get("/add-new")
-def get_add_new():
-    if not os.path.exists(DATA_FILE):
-        create_json_from_db()
-
-    with open(DATA_FILE, "r") as f:
-        data = json.load(f)
-
+async def load_add_new_data():
     return {
         "status": "success",
-        "data": data
+        "data": await add_new_store.get()
     }
 
+
+@router.get("/add-new")
+async def get_add_new(request: Request):
+    return await cached_json_response(
+        request,
+        "add_new",
+        ADD_NEW_SOURCES,
+        load_add_new_data
+    )
+
 # ==============================
 # POST ADD-NEW
 # ==============================
@@ -145,54 +219,35 @@ async def add_new_project(
         raise HTTPException(status_code=400, detail="Logo must be in .jpg format only")
 
     # --------------------------
-    # Upload Logo to Cloudinary
-    # --------------------------
-    logo_upload = cloudinary.uploader.upload(
-        await logo.read(),
-        folder="add_new/logos"
-    )
-    logo_url = logo_upload["secure_url"]
-
-    # --------------------------
-    # Upload Project Files
+    # Upload Logo + Project Files to Cloudinary
+    # (concurrent, streamed from the spooled temp files)
     # --------------------------
-    uploaded_files = []
-    for file in files:
-        result = cloudinary.uploader.upload(
-            await file.read(),
+    request_slots = request_upload_slots()  # one cap for logo and files
+
+    # Both calls finish before anything is raised: the spooled files are
+    # closed when the request ends and uploads may still be reading them
+    uploads = await asyncio.gather(
+        upload_media([logo], request_slots, folder="add_new/logos"),
+        upload_media(
+            files,
+            request_slots,
             folder=f"add_new/projects/{project_name}",
             resource_type="auto"
-        )
-        uploaded_files.append(result["secure_url"])
+        ),
+        return_exceptions=True
+    )
+    for result in uploads:
+        if isinstance(result, BaseException):
+            raise result
+
+    logo_uploads, file_uploads = uploads
+    logo_url = logo_uploads[0]["url"]
+    uploaded_files = [u["url"] for u in file_uploads]
 
     # --------------------------
-    # Update JSON File
+    # Update Add-New Catalog (in memory + append-only log)
     # --------------------------
-    if not os.path.exists(DATA_FILE):
-        create_json_from_db()
-
-    with open(DATA_FILE, "r") as f:
-        data = json.load(f)
-
-    if client_name not in data["clients"]:
-        data["clients"].append(client_name)
-
-    if industry_name not in data["industries"]:
-        data["industries"].append(industry_name)
-
-    if deliverable_name not in data["deliverables"]:
-        data["deliverables"].append(deliverable_name)
-
-    new_master_project = {
-        "project_name": project_name,
-        "location_name": location_name,
-        "location_url": location_url
-    }
-
-    if new_master_project not in data["projects_master"]:
-        data["projects_master"].append(new_master_project)
-
-    data["projects"].append({
+    await add_new_store.add({
         "client_name": client_name,
         "industry_name": industry_name,
         "deliverable_name": deliverable_name,
@@ -204,97 +259,68 @@ async def add_new_project(
         "created_at": datetime.utcnow().isoformat()
     })
 
-    with open(DATA_FILE, "w") as f:
-        json.dump(data, f, indent=4)
-
     # ==============================
     # DATABASE INSERT / UPDATE LOGIC
     # ==============================
 
+    # Hashed off the event loop; raw passwords are never stored
+    password_hash = await hash_password(password)
+
     try:
-        # -------- CLIENT (EMAIL UNIQUE) --------
-        existing_client = db.clients.find_one({"email_id": email_id})
-
-        if not existing_client:
-            last = db.clients.find_one({}, sort=[("client_code", -1)])
-            number = 1
-
-            if last and "client_code" in last:
-                try:
-                    number = int(last["client_code"].split("_")[1]) + 1
-                except:
-                    number = 1
-
-            client_doc = build_client_doc(
-                client_name, email_id, password, role, logo_url, number
-            )
-            db.clients.insert_one(client_doc)
-
-        else:
-            db.clients.update_one(
-                {"_id": existing_client["_id"]},
-                {
-                    "$set": {
-                        "client_name": client_name,
-                        "password": password,
-                        "role": role,
-                        "logo_path": logo_url,
-                        "updated_at": datetime.utcnow()
-                    }
-                }
-            )
+        await save_add_new_records(
+            client_name=client_name,
+            email_id=email_id,
+            password_hash=password_hash,
+            role=role,
+            logo_url=logo_url,
+            industry_name=industry_name,
+            project_name=project_name,
+            location_name=location_name,
+            location_url=location_url,
+            deliverable_name=deliverable_name
+        )
+    except Exception as e:
+        print("DB INSERT ERROR:", e)
+        raise HTTPException(status_code=500, detail="Failed to save project")
+    finally:
+        # The add-new catalog changed either way; new industries / projects /
+        # deliverables change the cascade tree
+        catalog.invalidate()
+        bump_version(*ADD_NEW_SOURCES)
 
-        # -------- INDUSTRY --------
-        existing_industry = db.industries.find_one({"industry_name": industry_name})
+    return {
+        "message": "Project added successfully",
+        "uploads": logo_uploads + file_uploads
+    }
 
-        if not existing_industry:
-            db.industries.insert_one(build_industry_doc(industry_name))
+# ==============================
+# BULK IMPORT
+# ==============================
+# CSV (header row) or NDJSON with the POST /add-new form fields minus the
+# files; client columns are optional per row. Runs in the background.
+# Rows set client passwords and roles, so both routes are super_admin only.
+
+@router.post("/add-new/bulk", status_code=202)
+async def bulk_import(
+    file: UploadFile = File(...),
+    format: str | None = Form(None),
+    user=Depends(require_super_admin)
+):
+    fmt = detect_format(file.filename, format)
 
-        industry = db.industries.find_one({"industry_name": industry_name})
-        industry_id = industry["_id"]
+    if not fmt:
+        raise HTTPException(status_code=400, detail="File must be .csv or .ndjson")
 
-        # -------- PROJECT MASTER --------
-        existing_project = db.projects_master.find_one({"project_name": project_name})
-
-        if not existing_project:
-            last = db.projects_master.find_one({}, sort=[("project_code", -1)])
-            number = 1
-            if last and "project_code" in last:
-                try:
-                    number = int(last["project_code"].split("_")[1]) + 1
-                except:
-                    number = 1
-
-            db.projects_master.insert_one(
-                build_project_doc(
-                    project_name, location_name, location_url, industry_id, number
-                )
-            )
-
-        project = db.projects_master.find_one({"project_name": project_name})
-        project_id_db = project["_id"]
+    job = await start_bulk_import(file, fmt)
 
-        # -------- DELIVERABLE --------
-        existing_deliverable = db.deliverables.find_one(
-            {"deliverable_name": deliverable_name}
-        )
+    return job.to_dict()
 
-        if not existing_deliverable:
-            last = db.deliverables.find_one({}, sort=[("deliverable_code", -1)])
-            number = 1
-            if last and "deliverable_code" in last:
-                try:
-                    number = int(last["deliverable_code"].split("_")[1]) + 1
-                except:
-                    number = 1
-
-            db.deliverables.insert_one(
-                build_deliverable_doc(
-                    deliverable_name, project_id_db, industry_id, number
-                )
-            )
 
-    except Exception as e:
-        print("DB INSERT ERROR:", e)
+@router.get("/add-new/bulk/{job_id}")
+async def bulk_import_status(job_id: str, user=Depends(require_super_admin)):
+    job = get_bulk_job(job_id)
+
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
 
-    return {"message": "Project added successfully"}
+    return job.to_dict()
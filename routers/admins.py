@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException
 from database import get_collections
 from auth.dependencies import get_current_user
+from utils.mongo_serializer import MongoJSONResponse
 
 router = APIRouter(prefix="/admins", tags=["Admins"])
 
@@ -28,8 +29,4 @@ async def get_admins(user=Depends(require_super_admin)):
         }
     ).to_list(100)
 
-    # Convert ObjectId to string
-    for u in users:
-        u["_id"] = str(u["_id"])
-
-    return users
+    return MongoJSONResponse(users)
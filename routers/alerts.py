@@ -1,59 +1,98 @@
-from fastapi import APIRouter, Depends
-from database import get_collections
+import asyncio
+from datetime import datetime
+from fastapi import APIRouter, Depends, Query
+from database import get_collections, ALERTS_SORT
 from auth.dependencies import get_current_user
+from services.name_maps import project_names, client_names
+from utils.pagination import keyset_filter, next_cursor
+from utils.mongo_serializer import MongoJSONResponse
 
 router = APIRouter(prefix="/alerts", tags=["Alerts"])
 
+ALERTS_PAGE_SIZE = 50
+ALERTS_MAX_PAGE_SIZE = 500
 
+ALERT_PROJECTION = {
+    "_id": 1,
+    "alert_code": 1,
+    "alert_details": 1,
+    "project_id": 1,
+    "assigned_to": 1,
+    "status": 1,
+    "severity": 1,
+    "issued_datetime": 1,
+    "resolved_datetime": 1
+}
+
+
+# Filters and the page limit are applied first; project and assignee names
+# are then resolved for the page only, from in-process id → name maps.
+# The next page cursor is returned in the X-Next-Cursor header.
 @router.get("/")
-async def get_alerts(user=Depends(get_current_user)):
+async def get_alerts(
+    status: str | None = None,
+    severity: str | None = None,
+    issued_from: datetime | None = None,
+    issued_to: datetime | None = None,
+    limit: int = Query(ALERTS_PAGE_SIZE, ge=1, le=ALERTS_MAX_PAGE_SIZE),
+    after: str | None = None,
+    user=Depends(get_current_user)
+):
 
     cols = get_collections()
 
-    pipeline = [
-        {
-            "$lookup": {
-                "from": "projects_master",
-                "localField": "project_id",
-                "foreignField": "_id",
-                "as": "project_info"
-            }
-        },
-        {
-            "$unwind": {
-                "path": "$project_info",
-                "preserveNullAndEmptyArrays": True
-            }
-        },
-        {
-            "$lookup": {
-                "from": "clients",
-                "localField": "assigned_to",
-                "foreignField": "_id",
-                "as": "assigned_user"
-            }
-        },
-        {
-            "$unwind": {
-                "path": "$assigned_user",
-                "preserveNullAndEmptyArrays": True
-            }
-        },
-        {
-            "$project": {
-                "_id": 0,
-                "alert_code": 1,
-                "alert_details": 1,
-                "project_name": "$project_info.project_name",
-                "assigned_to": "$assigned_user.client_name",
-                "status": 1,
-                "severity": 1,
-                "issued_datetime": 1,
-                "resolved_datetime": 1
-            }
+    query = keyset_filter("issued_datetime", after)
+
+    if status:
+        query["status"] = status
+
+    if severity:
+        query["severity"] = severity
+
+    if issued_from or issued_to:
+        # Merges with the $type filter from keyset_filter on the first page
+        query.setdefault("issued_datetime", {})
+        if issued_from:
+            query["issued_datetime"]["$gte"] = issued_from
+        if issued_to:
+            query["issued_datetime"]["$lte"] = issued_to
+
+    raw_alerts = await cols["alerts"].find(
+        query,
+        ALERT_PROJECTION
+    ).sort(ALERTS_SORT).limit(limit).to_list(limit)
+
+    projects, assignees = await asyncio.gather(
+        project_names.resolve(a.get("project_id") for a in raw_alerts),
+        client_names.resolve(a.get("assigned_to") for a in raw_alerts)
+    )
+
+    headers = {}
+    cursor_token = next_cursor("issued_datetime", raw_alerts, limit)
+    if cursor_token:
+        headers["X-Next-Cursor"] = cursor_token
+
+    alerts = []
+    for a in raw_alerts:
+        alert = {
+            key: a[key]
+            for key in (
+                "alert_code",
+                "alert_details",
+                "status",
+                "severity",
+                "issued_datetime",
+                "resolved_datetime"
+            )
+            if key in a
         }
-    ]
 
-    alerts = await cols["alerts"].aggregate(pipeline).to_list(None)
+        if a.get("project_id") in projects:
+            alert["project_name"] = projects[a["project_id"]]
+
+        if a.get("assigned_to") in assignees:
+            alert["assigned_to"] = assignees[a["assigned_to"]]
+
+        alerts.append(alert)
 
-    return alerts
+    return MongoJSONResponse(alerts, headers=headers)
@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from bson import ObjectId
 from bson.errors import InvalidId
 from database import get_collections
-from utils.mongo_serializer import serialize_mongo
+from utils.mongo_serializer import MongoJSONResponse
 from auth.dependencies import get_current_user
-from routers.reports import find_report_by_filters
+from routers.reports import find_report_with_analytics
+from services.catalog import catalog, industries_response
 
 router = APIRouter(prefix="/analytics", tags=["Analytics"])
 
@@ -15,6 +16,7 @@ router = APIRouter(prefix="/analytics", tags=["Analytics"])
 
 @router.get("/")
 async def get_analytics(
+    request: Request,
     industry_id: str | None = None,
     project_id: str | None = None,
     deliverable_id: str | None = None,
@@ -28,17 +30,7 @@ async def get_analytics(
     # ======================================================
     if not industry_id:
 
-        industries = await cols["industries"].find(
-            {},
-            {"_id": 1, "industry_name": 1}
-        ).to_list(None)
-
-        return {
-            "industries": [
-                {"id": str(i["_id"]), "name": i["industry_name"]}
-                for i in industries
-            ]
-        }
+        return await industries_response(request)
 
     # ======================================================
     # STEP 2 → INDUSTRY SELECTED → RETURN PROJECTS
@@ -50,16 +42,8 @@ async def get_analytics(
         except InvalidId:
             raise HTTPException(status_code=400, detail="Invalid industry_id")
 
-        projects = await cols["projects_master"].find(
-            {"industry_id": industry_obj},
-            {"_id": 1, "project_name": 1}
-        ).to_list(None)
-
         return {
-            "projects": [
-                {"id": str(p["_id"]), "name": p["project_name"]}
-                for p in projects
-            ]
+            "projects": await catalog.projects(industry_obj)
         }
 
     # ======================================================
@@ -72,16 +56,8 @@ async def get_analytics(
         except InvalidId:
             raise HTTPException(status_code=400, detail="Invalid project_id")
 
-        deliverables = await cols["deliverables"].find(
-            {"project_id": project_obj},
-            {"_id": 1, "deliverable_name": 1}
-        ).to_list(None)
-
         return {
-            "deliverables": [
-                {"id": str(d["_id"]), "name": d["deliverable_name"]}
-                for d in deliverables
-            ]
+            "deliverables": await catalog.deliverables(project_obj)
         }
 
     # ======================================================
@@ -96,20 +72,11 @@ async def get_analytics(
         except InvalidId:
             raise HTTPException(status_code=400, detail="Invalid ID format")
 
-        version_filter = {
-            "industry_id": industry_obj,
-            "project_id": project_obj,
-            "deliverable_id": deliverable_obj
-        }
-
-        # 🔥 Role based filtering
-        if user["role"] != "super_admin":
-            version_filter["client_id"] = ObjectId(user["client_id"])
-
-        versions = await cols["reports"].distinct("version", version_filter)
-
+        # 🔥 Role based filtering is applied by the catalog
         return {
-            "versions": sorted(versions)
+            "versions": await catalog.versions(
+                industry_obj, project_obj, deliverable_obj, user
+            )
         }
 
     # ======================================================
@@ -117,7 +84,7 @@ async def get_analytics(
     # ======================================================
     if industry_id and project_id and deliverable_id and version is not None:
 
-        report = await find_report_by_filters(
+        report, analytics = await find_report_with_analytics(
             cols,
             user,
             industry_id,
@@ -126,13 +93,9 @@ async def get_analytics(
             version
         )
 
-        analytics = await cols["analytics"].find_one({
-            "report_id": report["_id"]
-        })
-
         if not analytics:
             raise HTTPException(status_code=404, detail="Analytics not found")
 
-        return serialize_mongo(analytics)
+        return MongoJSONResponse(analytics)
 
     raise HTTPException(status_code=400, detail="Invalid request parameters")
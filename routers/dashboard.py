@@ -1,48 +1,68 @@
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException
-from services.dashboard_service import build_dashboard_response
-from database import get_collections
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from services.dashboard_service import get_dashboard_snapshot
+from database import get_collections, NOTIFICATIONS_SORT
 from bson import ObjectId
 from datetime import datetime
-from utils.mongo_serializer import serialize_mongo
+from utils.mongo_serializer import MongoJSONResponse, dumps_mongo
+import os
 import uuid
 import cloudinary.uploader
 from fastapi import Depends
 from auth.dependencies import get_current_user
+from utils.pagination import keyset_filter, next_cursor
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
-
-# ==========================
-# HELPER: Serialize ObjectId
-# ==========================
-def serialize_mongo(document):
-    if isinstance(document, list):
-        return [serialize_mongo(doc) for doc in document]
-
-    if isinstance(document, dict):
-        new_doc = {}
-        for key, value in document.items():
-            if isinstance(value, ObjectId):
-                new_doc[key] = str(value)
-            else:
-                new_doc[key] = value
-        return new_doc
-
-    return document
+NOTIFICATIONS_PAGE_SIZE = 50
+NOTIFICATIONS_MAX_PAGE_SIZE = 500
+# Upper bound for stream=true without an explicit limit
+NOTIFICATIONS_STREAM_MAX = int(os.getenv("NOTIFICATIONS_STREAM_MAX", "10000"))
 
 
 # DASHBOARD SUMMARY =
 @router.get("/")
 async def get_dashboard(user=Depends(get_current_user)):
-    return await build_dashboard_response()
+    return MongoJSONResponse(await get_dashboard_snapshot())
 
-#GET NOTIFICATIONS 
+# GET NOTIFICATIONS
+# Keyset-paginated on (created_at, _id); the next page cursor is returned
+# in the X-Next-Cursor header. stream=true writes NDJSON as the cursor yields.
 @router.get("/notifications")
-async def get_notifications(user=Depends(get_current_user)):
+async def get_notifications(
+    limit: int | None = Query(None, ge=1, le=NOTIFICATIONS_MAX_PAGE_SIZE),
+    after: str | None = None,
+    fields: str | None = None,
+    stream: bool = False,
+    user=Depends(get_current_user)
+):
     cols = get_collections()
 
-    notifications = await cols["notifications"].find().sort("created_at", -1).to_list(None)
+    projection = None
+    if fields:
+        projection = {f.strip(): 1 for f in fields.split(",") if f.strip()}
+        projection["created_at"] = 1  # needed for the cursor
+
+    cursor = cols["notifications"].find(
+        keyset_filter("created_at", after),
+        projection
+    ).sort(NOTIFICATIONS_SORT)
+
+    if stream:
+        cursor = cursor.limit(limit or NOTIFICATIONS_STREAM_MAX)
+
+        async def ndjson():
+            async for doc in cursor:
+                yield dumps_mongo(doc) + "\n"
+
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+    page_size = limit or NOTIFICATIONS_PAGE_SIZE
+    notifications = await cursor.limit(page_size).to_list(page_size)
 
+    headers = {}
+    cursor_token = next_cursor("created_at", notifications, page_size)
+    if cursor_token:
+        headers["X-Next-Cursor"] = cursor_token
 
-    # Convert ObjectId to string
-    return serialize_mongo(notifications)
+    return MongoJSONResponse(notifications, headers=headers)
@@ -1,61 +1,72 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from database import get_collections
 from auth.dependencies import get_current_user
+from services.name_maps import industry_names
+from utils.response_cache import cached_json_response
 
 router = APIRouter(prefix="/projects", tags=["Projects"])
 
+DATE_FORMAT = "%d-%m-%Y %H:%M"
+
+PROJECT_PROJECTION = {
+    "_id": 0,
+    "project_code": 1,
+    "project_name": 1,
+    "industry_id": 1,
+    "location_name": 1,
+    "status": 1,
+    "project_image_path": 1,
+    "created_at": 1,
+    "updated_at": 1
+}
+
+
+def format_date(value):
+    return value.strftime(DATE_FORMAT) if value else None
+
 
 @router.get("/")
-async def get_projects(user=Depends(get_current_user)):
+async def get_projects(request: Request, user=Depends(get_current_user)):
+    return await cached_json_response(
+        request,
+        "projects",
+        ("projects_master", "industries"),
+        list_projects
+    )
+
+
+async def list_projects():
 
     cols = get_collections()
 
-    pipeline = [
-        {
-            "$lookup": {
-                "from": "industries",
-                "localField": "industry_id",
-                "foreignField": "_id",
-                "as": "industry_info"
-            }
-        },
-        {
-            "$unwind": {
-                "path": "$industry_info",
-                "preserveNullAndEmptyArrays": True
-            }
-        },
-        {
-            "$project": {
-                "_id": 0,
-                "project_code": 1,
-                "project_name": 1,
-                "industry_name": "$industry_info.industry_name",
-                "location_name": 1,
-                "status": 1,
-
-                # ✅ Added Image URL
-                "image_url": {
-                    "$ifNull": ["$project_image_path", ""]
-                },
-
-                # ✅ Formatted Dates
-                "created_at": {
-                    "$dateToString": {
-                        "format": "%d-%m-%Y %H:%M",
-                        "date": "$created_at"
-                    }
-                },
-                "updated_at": {
-                    "$dateToString": {
-                        "format": "%d-%m-%Y %H:%M",
-                        "date": "$updated_at"
-                    }
-                }
-            }
+    raw_projects = await cols["projects_master"].find(
+        {},
+        PROJECT_PROJECTION
+    ).to_list(None)
+
+    # Industry names come from the in-process dictionary instead of a $lookup
+    industries = await industry_names.resolve(
+        {p.get("industry_id") for p in raw_projects}
+    )
+
+    projects = []
+    for p in raw_projects:
+        project = {
+            key: p[key]
+            for key in ("project_code", "project_name", "location_name", "status")
+            if key in p
         }
-    ]
 
-    projects = await cols["projects_master"].aggregate(pipeline).to_list(None)
+        if p.get("industry_id") in industries:
+            project["industry_name"] = industries[p["industry_id"]]
+
+        # ✅ Added Image URL
+        project["image_url"] = p.get("project_image_path") or ""
+
+        # ✅ Formatted Dates
+        project["created_at"] = format_date(p.get("created_at"))
+        project["updated_at"] = format_date(p.get("updated_at"))
+
+        projects.append(project)
 
     return projects
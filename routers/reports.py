@@ -1,12 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from pydantic import BaseModel, Field
 from bson import ObjectId
 from bson.errors import InvalidId
 from database import get_collections
-from utils.mongo_serializer import serialize_mongo
+from utils.mongo_serializer import MongoJSONResponse
 from auth.dependencies import get_current_user
+from services.catalog import catalog, industries_response
 
 router = APIRouter(prefix="/reports", tags=["Reports"])
 
+MAX_BATCH_ITEMS = 50
+
+
+class ReportVersionKey(BaseModel):
+    deliverable_id: str
+    version: int
+
+
+class ReportBatchRequest(BaseModel):
+    items: list[ReportVersionKey] = Field(..., min_length=1, max_length=MAX_BATCH_ITEMS)
+
 
 # ======================================================
 # HELPER FUNCTION → Safe ObjectId Conversion
@@ -19,10 +32,47 @@ def to_object_id(id_str: str, field_name: str):
         raise HTTPException(status_code=400, detail=f"Invalid {field_name}")
 
 
+# ======================================================
+# HELPER FUNCTION → Role Based Client Filter
+# ======================================================
+
+def client_scope(user):
+    # 🔥 Role Based Filtering
+    if user["role"] != "super_admin":
+        return {"client_id": ObjectId(user["client_id"])}
+    return {}
+
+
+def analytics_lookup():
+    return {
+        "$lookup": {
+            "from": "analytics",
+            "localField": "_id",
+            "foreignField": "report_id",
+            "as": "analytics"
+        }
+    }
+
+
+def split_analytics(report):
+    analytics = report.pop("analytics", [])
+    return report, analytics[0] if analytics else None
+
+
 # ======================================================
 # HELPER FUNCTION → Find Report By Filters
 # ======================================================
 
+def build_report_query(user, industry_id, project_id, deliverable_id, version):
+    return {
+        "industry_id": to_object_id(industry_id, "industry_id"),
+        "project_id": to_object_id(project_id, "project_id"),
+        "deliverable_id": to_object_id(deliverable_id, "deliverable_id"),
+        "version": version,
+        **client_scope(user)
+    }
+
+
 async def find_report_by_filters(
     cols,
     user,
@@ -31,20 +81,7 @@ async def find_report_by_filters(
     deliverable_id,
     version
 ):
-    industry_obj = to_object_id(industry_id, "industry_id")
-    project_obj = to_object_id(project_id, "project_id")
-    deliverable_obj = to_object_id(deliverable_id, "deliverable_id")
-
-    query = {
-        "industry_id": industry_obj,
-        "project_id": project_obj,
-        "deliverable_id": deliverable_obj,
-        "version": version
-    }
-
-    # 🔥 Role Based Filtering
-    if user["role"] != "super_admin":
-        query["client_id"] = ObjectId(user["client_id"])
+    query = build_report_query(user, industry_id, project_id, deliverable_id, version)
 
     report = await cols["reports"].find_one(query)
 
@@ -54,12 +91,38 @@ async def find_report_by_filters(
     return report
 
 
+async def find_report_with_analytics(
+    cols,
+    user,
+    industry_id,
+    project_id,
+    deliverable_id,
+    version
+):
+    """
+    Report and its analytics in one round trip → (report, analytics | None)
+    """
+    query = build_report_query(user, industry_id, project_id, deliverable_id, version)
+
+    reports = await cols["reports"].aggregate([
+        {"$match": query},
+        {"$limit": 1},
+        analytics_lookup()
+    ]).to_list(1)
+
+    if not reports:
+        raise HTTPException(status_code=404, detail="Report not found")
+
+    return split_analytics(reports[0])
+
+
 # ======================================================
 # 1️⃣ SINGLE DYNAMIC REPORTS ENDPOINT (CASCADING)
 # ======================================================
 
 @router.get("/")
 async def get_reports(
+    request: Request,
     industry_id: str | None = None,
     project_id: str | None = None,
     deliverable_id: str | None = None,
@@ -73,17 +136,7 @@ async def get_reports(
     # ======================================================
     if not industry_id:
 
-        industries = await cols["industries"].find(
-            {},
-            {"_id": 1, "industry_name": 1}
-        ).to_list(None)
-
-        return {
-            "industries": [
-                {"id": str(i["_id"]), "name": i["industry_name"]}
-                for i in industries
-            ]
-        }
+        return await industries_response(request)
 
     # ======================================================
     # STEP 2 → INDUSTRY SELECTED → RETURN PROJECTS
@@ -92,16 +145,8 @@ async def get_reports(
 
         industry_obj = to_object_id(industry_id, "industry_id")
 
-        projects = await cols["projects_master"].find(
-            {"industry_id": industry_obj},
-            {"_id": 1, "project_name": 1}
-        ).to_list(None)
-
         return {
-            "projects": [
-                {"id": str(p["_id"]), "name": p["project_name"]}
-                for p in projects
-            ]
+            "projects": await catalog.projects(industry_obj)
         }
 
     # ======================================================
@@ -111,16 +156,8 @@ async def get_reports(
 
         project_obj = to_object_id(project_id, "project_id")
 
-        deliverables = await cols["deliverables"].find(
-            {"project_id": project_obj},
-            {"_id": 1, "deliverable_name": 1}
-        ).to_list(None)
-
         return {
-            "deliverables": [
-                {"id": str(d["_id"]), "name": d["deliverable_name"]}
-                for d in deliverables
-            ]
+            "deliverables": await catalog.deliverables(project_obj)
         }
 
     # ======================================================
@@ -132,24 +169,11 @@ async def get_reports(
         project_obj = to_object_id(project_id, "project_id")
         deliverable_obj = to_object_id(deliverable_id, "deliverable_id")
 
-        version_filter = {
-            "industry_id": industry_obj,
-            "project_id": project_obj,
-            "deliverable_id": deliverable_obj,
-            "version": {"$ne": None}  # 🔥 Exclude null versions
-        }
-
-        # 🔥 Role-based filtering
-        if user["role"] != "super_admin":
-            version_filter["client_id"] = ObjectId(user["client_id"])
-
-        versions = await cols["reports"].distinct("version", version_filter)
-
-        # Remove None safely (double safety)
-        versions = [v for v in versions if v is not None]
-
+        # Null versions are excluded and role-based filtering applied by the catalog
         return {
-            "versions": sorted(versions) if versions else []
+            "versions": await catalog.versions(
+                industry_obj, project_obj, deliverable_obj, user
+            )
         }
 
     # ======================================================
@@ -166,7 +190,7 @@ async def get_reports(
             version
         )
 
-        return serialize_mongo(report)
+        return MongoJSONResponse(report)
 
     raise HTTPException(status_code=400, detail="Invalid request parameters")
 
@@ -185,7 +209,7 @@ async def get_full_report(
 ):
     cols = get_collections()
 
-    report = await find_report_by_filters(
+    report, analytics = await find_report_with_analytics(
         cols,
         user,
         industry_id,
@@ -194,11 +218,66 @@ async def get_full_report(
         version
     )
 
-    analytics = await cols["analytics"].find_one({
-        "report_id": report["_id"]
+    return MongoJSONResponse({
+        "report": report,
+        "analytics": analytics
     })
 
-    return {
-        "report": serialize_mongo(report),
-        "analytics": serialize_mongo(analytics) if analytics else None
-    }
\ No newline at end of file
+
+# ======================================================
+# 3️⃣ BATCH REPORT + ANALYTICS (MULTI-VERSION)
+# ======================================================
+
+@router.post("/analytics/batch")
+async def get_full_reports_batch(
+    data: ReportBatchRequest,
+    user=Depends(get_current_user)
+):
+    cols = get_collections()
+
+    keys = [
+        (to_object_id(item.deliverable_id, "deliverable_id"), item.version)
+        for item in data.items
+    ]
+
+    # One query matching only the requested pairs; each $or branch is an
+    # index point lookup, and the $lookup runs once per pair
+    reports = await cols["reports"].aggregate([
+        {
+            "$match": {
+                "$or": [
+                    {"deliverable_id": deliverable_id, "version": version}
+                    for deliverable_id, version in set(keys)
+                ],
+                **client_scope(user)
+            }
+        },
+        {
+            "$group": {
+                "_id": {"deliverable_id": "$deliverable_id", "version": "$version"},
+                "report": {"$first": "$$ROOT"}
+            }
+        },
+        {"$replaceRoot": {"newRoot": "$report"}},
+        analytics_lookup()
+    ]).to_list(None)
+
+    found = {}
+    for report in reports:
+        found.setdefault((report["deliverable_id"], report["version"]), report)
+
+    results = []
+    for item, key in zip(data.items, keys):
+        report = found.get(key)
+        analytics = None
+        if report:
+            report, analytics = split_analytics(dict(report))
+
+        results.append({
+            "deliverable_id": item.deliverable_id,
+            "version": item.version,
+            "report": report,
+            "analytics": analytics
+        })
+
+    return MongoJSONResponse({"results": results})
@@ -0,0 +1,55 @@
+from datetime import datetime
+
+
+# ==============================
+# Helper Builders
+# ==============================
+# Shared by POST /add-new and the bulk importer
+
+def build_client_doc(client_name, email_id, password, role, logo_url, number):
+    return {
+        "client_code": f"C_{number}",
+        "client_name": client_name,
+        "email_id": email_id,
+        "password": password,
+        "role": role,
+        "status": "Active",
+        "logo_path": logo_url,
+        "created_at": datetime.utcnow(),
+        "updated_at": datetime.utcnow()
+    }
+
+
+def build_industry_doc(industry_name):
+    return {
+        "industry_code": industry_name[:3].upper(),
+        "industry_name": industry_name,
+        "industry_image_url": "",
+        "created_at": datetime.utcnow(),
+        "updated_at": datetime.utcnow()
+    }
+
+
+def build_project_doc(project_name, location_name, location_url, industry_id, number):
+    return {
+        "project_code": f"PRJ_{number}",
+        "project_name": project_name,
+        "project_image_path": "",
+        "location_name": location_name,
+        "location_url": location_url,
+        "industry_id": industry_id,
+        "status": "Planning",
+        "created_at": datetime.utcnow(),
+        "updated_at": datetime.utcnow()
+    }
+
+
+def build_deliverable_doc(deliverable_name, project_id, industry_id, number):
+    return {
+        "deliverable_code": f"DEL_{number}",
+        "deliverable_name": deliverable_name,
+        "project_id": project_id,
+        "industry_id": industry_id,
+        "created_at": datetime.utcnow(),
+        "updated_at": datetime.utcnow()
+    }
@@ -0,0 +1,331 @@
+import os
+import json
+import uuid
+import asyncio
+from contextlib import asynccontextmanager
+from database import get_db
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, one worker per data dir
+    fcntl = None
+
+# Collections whose writes change the GET /add-new payload
+ADD_NEW_SOURCES = ("clients", "industries", "projects_master", "deliverables", "add_new_data")
+
+ADD_NEW_DATA_DIR = os.getenv("ADD_NEW_DATA_DIR", "data")
+# Log entries applied before the snapshot is rewritten and the log truncated
+ADD_NEW_SNAPSHOT_EVERY = int(os.getenv("ADD_NEW_SNAPSHOT_EVERY", "200"))
+
+
+class AddNewStore:
+    """
+    In-memory copy of the GET /add-new payload with hash-set indexes for
+    the duplicate checks.
+
+    Persistence: add() / add_names() append one JSON line to
+    add_new_data.log; every ADD_NEW_SNAPSHOT_EVERY log lines the whole
+    payload is written to add_new_data.json through a temp file and
+    os.replace, then the log is replaced by a new one (header line only). Log lines carry a
+    sequence number and the snapshot records the last one it contains, so
+    a crash between the two steps never replays an entry twice.
+
+    Workers sharing a data directory take an flock on add_new_data.lock
+    around every write. Under it a worker first applies the lines other
+    workers appended since its last read (and reloads the snapshot if the
+    log was replaced), so sequence numbers stay unique across workers and
+    a snapshot always contains every logged entry. Without fcntl (Windows)
+    only one worker may use a data directory.
+    """
+
+    def __init__(self, data_dir=ADD_NEW_DATA_DIR, snapshot_every=ADD_NEW_SNAPSHOT_EVERY):
+        self.snapshot_path = os.path.join(data_dir, "add_new_data.json")
+        self.log_path = os.path.join(data_dir, "add_new_data.log")
+        self.lock_path = os.path.join(data_dir, "add_new_data.lock")
+        self.snapshot_every = snapshot_every
+
+        self._lock = asyncio.Lock()
+        self._loaded = False
+        self._seq = 0
+        self._logged = 0     # lines in the current log, from every worker
+        self._log_id = None  # header id of the log last read; new on every snapshot
+        self._offset = 0     # bytes of that log already applied
+        self._reset({})
+
+    def _reset(self, data):
+        self.data = {
+            "clients": list(data.get("clients", [])),
+            "industries": list(data.get("industries", [])),
+            "deliverables": list(data.get("deliverables", [])),
+            "projects_master": list(data.get("projects_master", [])),
+            "projects": list(data.get("projects", []))
+        }
+
+        self._clients = set(self.data["clients"])
+        self._industries = set(self.data["industries"])
+        self._deliverables = set(self.data["deliverables"])
+        self._masters = {_master_key(m) for m in self.data["projects_master"]}
+
+    # ==========================
+    # CROSS-PROCESS LOCK
+    # ==========================
+    def _acquire_file_lock(self):
+        os.makedirs(os.path.dirname(self.lock_path) or ".", exist_ok=True)
+        fd = os.open(self.lock_path, os.O_CREAT | os.O_RDWR)
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        return fd
+
+    @asynccontextmanager
+    async def _file_lock(self):
+        # Blocking flock on a thread; released (close) from the loop
+        fd = await asyncio.to_thread(self._acquire_file_lock)
+        try:
+            yield
+        finally:
+            os.close(fd)
+
+    # ==========================
+    # LOAD / PERSIST
+    # ==========================
+    async def ensure_loaded(self):
+        if self._loaded:
+            return
+
+        async with self._lock:
+            if not self._loaded:
+                async with self._file_lock():
+                    await self._load()
+                self._loaded = True
+
+    async def _load(self):
+        snapshot = await asyncio.to_thread(self._read_snapshot)
+
+        if snapshot is None:
+            self._reset(await _load_from_db())
+        elif "seq" in snapshot:
+            self._seq = snapshot["seq"]
+            self._reset(snapshot["data"])
+        else:
+            # File written before the log existed: the bare payload
+            self._reset(snapshot)
+
+        self._log_id, self._offset = None, 0
+        await self._catch_up()
+        await asyncio.to_thread(self._write_snapshot)
+
+    def _read_snapshot(self):
+        if not os.path.exists(self.snapshot_path):
+            return None
+
+        with open(self.snapshot_path, "r") as f:
+            return json.load(f)
+
+    def _read_log(self):
+        """
+        Lines appended since the last read, as (log_id, entries, offset,
+        lines). Each log starts with a {"log": id} header line; the id
+        differs from self._log_id when the log was replaced.
+        """
+        if not os.path.exists(self.log_path):
+            return None, [], 0, 0
+
+        entries = []
+        with open(self.log_path, "rb") as f:
+            first = f.readline()
+            try:
+                log_id = json.loads(first).get("log")
+            except ValueError:
+                log_id = None
+
+            if log_id is not None and log_id == self._log_id:
+                offset, lines = self._offset, self._logged
+            else:
+                # New log; a headerless one predates the lock and is read whole
+                offset, lines = (len(first) if log_id else 0), 0
+
+            f.seek(offset)
+            for line in f:
+                offset += len(line)
+                lines += 1
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    continue  # torn line from a crash mid-append
+
+        return log_id, entries, offset, lines
+
+    async def _catch_up(self):
+        """
+        Applies log lines other workers wrote since this one last read.
+        Caller holds the file lock.
+        """
+        log_id, entries, offset, lines = await asyncio.to_thread(self._read_log)
+
+        if self._log_id is not None and log_id != self._log_id:
+            # Replaced after another worker's snapshot, which contains
+            # everything the old log held
+            snapshot = await asyncio.to_thread(self._read_snapshot)
+            if snapshot and snapshot.get("seq", 0) > self._seq:
+                self._seq = snapshot["seq"]
+                self._reset(snapshot["data"])
+
+        for entry in entries:
+            if entry["seq"] > self._seq:
+                self._apply_entry(entry)
+                self._seq = entry["seq"]
+
+        self._log_id, self._offset, self._logged = log_id, offset, lines
+
+    def _append_log(self, entry):
+        with open(self.log_path, "a+b") as f:
+            # Terminate a torn line left by a crash so this entry stays whole
+            if f.tell():
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")
+
+            f.write((json.dumps(entry, separators=(",", ":")) + "\n").encode())
+            f.flush()
+            os.fsync(f.fileno())
+            return f.tell()
+
+    def _write_snapshot(self):
+        os.makedirs(os.path.dirname(self.snapshot_path) or ".", exist_ok=True)
+
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"seq": self._seq, "data": self.data}, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(tmp_path, self.snapshot_path)
+
+        # Everything in the log is now covered by the snapshot. The new log
+        # gets a fresh id, which tells the other workers to reload the snapshot.
+        log_id = uuid.uuid4().hex
+        header = (json.dumps({"log": log_id}) + "\n").encode()
+
+        tmp_log = self.log_path + ".tmp"
+        with open(tmp_log, "wb") as f:
+            f.write(header)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_log, self.log_path)
+
+        self._log_id = log_id
+        self._offset = len(header)
+        self._logged = 0
+
+    async def snapshot(self):
+        async with self._lock:
+            if not self._loaded:
+                return
+
+            async with self._file_lock():
+                await self._catch_up()
+                if self._logged:
+                    await asyncio.to_thread(self._write_snapshot)
+
+    # ==========================
+    # READ / WRITE
+    # ==========================
+    def _apply_entry(self, entry):
+        if "project" in entry:
+            self._apply_names(entry["project"])
+            self.data["projects"].append(entry["project"])
+
+        for names in entry.get("names", []):
+            self._apply_names(names)
+
+    def _apply_names(self, project):
+        client_name = project.get("client_name")
+        if client_name and client_name not in self._clients:
+            self._clients.add(client_name)
+            self.data["clients"].append(client_name)
+
+        if project["industry_name"] not in self._industries:
+            self._industries.add(project["industry_name"])
+            self.data["industries"].append(project["industry_name"])
+
+        if project["deliverable_name"] not in self._deliverables:
+            self._deliverables.add(project["deliverable_name"])
+            self.data["deliverables"].append(project["deliverable_name"])
+
+        master = {
+            "project_name": project["project_name"],
+            "location_name": project["location_name"],
+            "location_url": project["location_url"]
+        }
+        if _master_key(master) not in self._masters:
+            self._masters.add(_master_key(master))
+            self.data["projects_master"].append(master)
+
+    async def get(self) -> dict:
+        await self.ensure_loaded()
+        return self.data
+
+    async def add(self, project: dict):
+        await self._append({"project": project})
+
+    async def add_names(self, entries: list[dict]):
+        """
+        Catalog names without a projects history entry (bulk imports),
+        one log line per call
+        """
+        if entries:
+            await self._append({"names": entries})
+
+    async def _append(self, entry):
+        await self.ensure_loaded()
+
+        async with self._lock, self._file_lock():
+            await self._catch_up()
+
+            self._seq += 1
+            entry = {"seq": self._seq, **entry}
+
+            self._offset = await asyncio.to_thread(self._append_log, entry)
+            self._apply_entry(entry)
+            self._logged += 1
+
+            if self._logged >= self.snapshot_every:
+                await asyncio.to_thread(self._write_snapshot)
+
+
+def _master_key(master):
+    return (
+        master.get("project_name"),
+        master.get("location_name"),
+        master.get("location_url")
+    )
+
+
+async def _load_from_db():
+    db = get_db()
+
+    clients, industries, deliverables, projects_master = await asyncio.gather(
+        db.clients.find({}, {"_id": 0, "client_name": 1}).to_list(length=None),
+        db.industries.find({}, {"_id": 0, "industry_name": 1}).to_list(length=None),
+        db.deliverables.find({}, {"_id": 0, "deliverable_name": 1}).to_list(length=None),
+        db.projects_master.find(
+            {},
+            {
+                "_id": 0,
+                "project_name": 1,
+                "location_name": 1,
+                "location_url": 1
+            }
+        ).to_list(length=None)
+    )
+
+    return {
+        "clients": [c["client_name"] for c in clients],
+        "industries": [i["industry_name"] for i in industries],
+        "deliverables": [d["deliverable_name"] for d in deliverables],
+        "projects_master": projects_master,
+        "projects": []
+    }
+
+
+add_new_store = AddNewStore()
@@ -0,0 +1,490 @@
+import os
+import csv
+import json
+import time
+import uuid
+import shutil
+import asyncio
+import tempfile
+from datetime import datetime
+from itertools import islice
+from collections import OrderedDict
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from database import get_collections
+from services.add_new_docs import (
+    build_client_doc,
+    build_industry_doc,
+    build_project_doc,
+    build_deliverable_doc
+)
+from services.add_new_store import add_new_store, ADD_NEW_SOURCES
+from services.counters import client_codes, project_codes, deliverable_codes
+from services.catalog import catalog
+from services.name_maps import client_names, industry_names
+from services.dashboard_service import rebuild_dashboard_snapshot
+from utils.response_cache import bump_version
+from auth.passwords import hash_password
+from auth.profile_cache import profile_cache
+
+BULK_IMPORT_BATCH_SIZE = int(os.getenv("BULK_IMPORT_BATCH_SIZE", "500"))
+BULK_IMPORT_MAX_JOBS = int(os.getenv("BULK_IMPORT_MAX_JOBS", "100"))
+# Rejects kept per job for GET /add-new/bulk/{job_id}; the count is always exact
+BULK_IMPORT_MAX_REJECTS = int(os.getenv("BULK_IMPORT_MAX_REJECTS", "1000"))
+
+BULK_IMPORT_FORMATS = ("csv", "ndjson")
+
+DUPLICATE_KEY = 11000
+
+REQUIRED_FIELDS = ("industry_name", "project_name", "deliverable_name")
+CLIENT_FIELDS = ("client_name", "email_id", "password", "role")
+TEXT_FIELDS = REQUIRED_FIELDS + CLIENT_FIELDS + ("location_name", "location_url", "logo_url")
+
+
+class BulkImportJob:
+    """
+    Progress of one POST /add-new/bulk upload, polled through
+    GET /add-new/bulk/{job_id}
+    """
+
+    def __init__(self, fmt, filename):
+        self.job_id = uuid.uuid4().hex
+        self.format = fmt
+        self.filename = filename
+        self.status = "queued"
+        self.error = None
+        self.rows_read = 0
+        self.rows_imported = 0
+        self.rows_rejected = 0
+        self.rejects = []
+        self.inserted = {"clients": 0, "industries": 0, "projects_master": 0, "deliverables": 0}
+        self.updated_clients = 0
+        self.created_at = time.time()
+        self.finished_at = None
+
+    def reject(self, row_number, reason):
+        self.rows_rejected += 1
+        if len(self.rejects) < BULK_IMPORT_MAX_REJECTS:
+            self.rejects.append({"row": row_number, "error": reason})
+
+    def to_dict(self):
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "format": self.format,
+            "filename": self.filename,
+            "rows_read": self.rows_read,
+            "rows_imported": self.rows_imported,
+            "rows_rejected": self.rows_rejected,
+            "inserted": self.inserted,
+            "updated_clients": self.updated_clients,
+            "rejects": self.rejects,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at
+        }
+
+
+# Recent jobs, oldest first; finished jobs are evicted past BULK_IMPORT_MAX_JOBS
+bulk_jobs = OrderedDict()
+_running = set()
+
+
+def get_bulk_job(job_id):
+    return bulk_jobs.get(job_id)
+
+
+def detect_format(filename, declared=None):
+    fmt = (declared or os.path.splitext(filename or "")[1].lstrip(".")).lower()
+    if fmt == "jsonl":
+        fmt = "ndjson"
+    return fmt if fmt in BULK_IMPORT_FORMATS else None
+
+
+async def start_bulk_import(upload, fmt) -> BulkImportJob:
+    """
+    Copies the upload to a temp file owned by the job (the request closes
+    its own) and starts the import in the background
+    """
+    spool = tempfile.NamedTemporaryFile(prefix="bulk-import-", suffix=f".{fmt}", delete=False)
+    try:
+        await asyncio.to_thread(shutil.copyfileobj, upload.file, spool)
+    finally:
+        spool.close()
+
+    job = BulkImportJob(fmt, upload.filename)
+    bulk_jobs[job.job_id] = job
+    _evict_finished_jobs()
+
+    task = asyncio.create_task(_run(job, spool.name))
+    _running.add(task)
+    task.add_done_callback(_running.discard)
+
+    return job
+
+
+def _evict_finished_jobs():
+    for job_id in list(bulk_jobs):
+        if len(bulk_jobs) <= BULK_IMPORT_MAX_JOBS:
+            break
+        if bulk_jobs[job_id].status in ("done", "failed"):
+            del bulk_jobs[job_id]
+
+
+# ==============================
+# PARSING (streamed, off the loop)
+# ==============================
+
+def _iter_rows(f, fmt):
+    """
+    Yields (row_number, row_dict | None, error) from an open text file
+    """
+    if fmt == "csv":
+        for number, row in enumerate(csv.DictReader(f), start=1):
+            yield number, row, None
+        return
+
+    for number, line in enumerate(f, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield number, None, "Invalid JSON"
+            continue
+
+        if isinstance(row, dict):
+            yield number, row, None
+        else:
+            yield number, None, "Row must be a JSON object"
+
+
+def _clean(row):
+    """
+    Normalised row, or an error message
+    """
+    cleaned = {}
+    for field in TEXT_FIELDS:
+        value = row.get(field)
+        if value is not None and not isinstance(value, str):
+            return None, f"{field} must be a string"
+        cleaned[field] = (value or "").strip()
+
+    missing = [f for f in REQUIRED_FIELDS if not cleaned[f]]
+    if missing:
+        return None, f"Missing {', '.join(missing)}"
+
+    # Client columns are optional, but all-or-nothing
+    given = [f for f in CLIENT_FIELDS if cleaned[f]]
+    if given and len(given) != len(CLIENT_FIELDS):
+        missing = [f for f in CLIENT_FIELDS if not cleaned[f]]
+        return None, f"Missing {', '.join(missing)}"
+
+    return cleaned, None
+
+
+# ==============================
+# IMPORT
+# ==============================
+
+async def _load_maps():
+    """
+    name -> _id for industries and projects, names / emails for the rest:
+    one projected find per collection for the whole job
+    """
+    cols = get_collections()
+
+    industries, projects, deliverables, clients = await asyncio.gather(
+        cols["industries"].find({}, {"industry_name": 1}).to_list(length=None),
+        cols["projects_master"].find({}, {"project_name": 1}).to_list(length=None),
+        cols["deliverables"].find({}, {"_id": 0, "deliverable_name": 1}).to_list(length=None),
+        cols["clients"].find({}, {"_id": 0, "email_id": 1}).to_list(length=None)
+    )
+
+    return {
+        "industries": {i.get("industry_name"): i["_id"] for i in industries},
+        "projects": {p.get("project_name"): p["_id"] for p in projects},
+        "deliverables": {d.get("deliverable_name") for d in deliverables},
+        "clients": {c.get("email_id") for c in clients}
+    }
+
+
+async def _run(job, path):
+    job.status = "running"
+    status = "done"
+
+    try:
+        maps = await _load_maps()
+
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            rows = _iter_rows(f, job.format)
+
+            while True:
+                batch = await asyncio.to_thread(
+                    lambda: list(islice(rows, BULK_IMPORT_BATCH_SIZE))
+                )
+                if not batch:
+                    break
+
+                await _import_batch(job, batch, maps)
+
+    except Exception as e:
+        print("BULK IMPORT ERROR:", e)
+        status = "failed"
+        job.error = str(e)
+
+    finally:
+        os.remove(path)
+        # Rows already written are visible after a failure too
+        await _refresh_caches()
+
+        # Pollers only see the final status once caches are consistent
+        job.status = status
+        job.finished_at = time.time()
+
+
+async def _import_batch(job, batch, maps):
+    job.rows_read += len(batch)
+
+    valid = []
+    for number, row, error in batch:
+        if row is not None:
+            row, error = _clean(row)
+        if error:
+            job.reject(number, error)
+        else:
+            valid.append((number, row))
+
+    failed = set()
+
+    def fail(number, reason):
+        if number not in failed:
+            failed.add(number)
+            job.reject(number, reason)
+
+    # bcrypt runs on the password executor while the catalog is written
+    clients = [(number, row) for number, row in valid if row["email_id"]]
+    _, hashes = await asyncio.gather(
+        _import_catalog(job, valid, maps, fail),
+        asyncio.gather(*(hash_password(row["password"]) for _, row in clients))
+    )
+
+    # A row is all or nothing: clients are written only for rows whose
+    # industry, project and deliverable were stored
+    await _import_clients(job, [
+        (number, row, password)
+        for (number, row), password in zip(clients, hashes)
+        if number not in failed
+    ], maps, fail)
+
+    imported = [row for number, row in valid if number not in failed]
+    job.rows_imported += len(imported)
+
+    await add_new_store.add_names([
+        {
+            "client_name": row["client_name"] or None,
+            "industry_name": row["industry_name"],
+            "deliverable_name": row["deliverable_name"],
+            "project_name": row["project_name"],
+            "location_name": row["location_name"],
+            "location_url": row["location_url"]
+        }
+        for row in imported
+    ])
+
+
+async def _import_catalog(job, valid, maps, fail):
+    """
+    Industries, then projects, then deliverables: each level references
+    the _ids actually stored by the one before it, never a generated one
+    """
+    # -------- INDUSTRY --------
+    docs = {}
+    for _, row in valid:
+        name = row["industry_name"]
+        if name not in maps["industries"] and name not in docs:
+            docs[name] = build_industry_doc(name)
+
+    ids, errors = await _upsert_by_name(job, "industries", "industry_name", docs)
+    maps["industries"].update(ids)
+    rows = _stored_rows(valid, "industry_name", maps["industries"], "industries", errors, fail)
+
+    # -------- PROJECT MASTER --------
+    docs = {}
+    for _, row in rows:
+        name = row["project_name"]
+        if name not in maps["projects"] and name not in docs:
+            docs[name] = build_project_doc(
+                name,
+                row["location_name"],
+                row["location_url"],
+                maps["industries"][row["industry_name"]],
+                await project_codes.next()
+            )
+
+    ids, errors = await _upsert_by_name(job, "projects_master", "project_name", docs)
+    maps["projects"].update(ids)
+    rows = _stored_rows(rows, "project_name", maps["projects"], "projects_master", errors, fail)
+
+    # -------- DELIVERABLE --------
+    docs = {}
+    for _, row in rows:
+        name = row["deliverable_name"]
+        if name not in maps["deliverables"] and name not in docs:
+            docs[name] = build_deliverable_doc(
+                name,
+                maps["projects"][row["project_name"]],
+                maps["industries"][row["industry_name"]],
+                await deliverable_codes.next()
+            )
+
+    ids, errors = await _upsert_by_name(job, "deliverables", "deliverable_name", docs)
+    maps["deliverables"].update(ids)
+    _stored_rows(rows, "deliverable_name", maps["deliverables"], "deliverables", errors, fail)
+
+
+def _stored_rows(rows, field, stored, collection, errors, fail):
+    """
+    Rows whose `field` name is stored; the rest are rejected with the
+    write error of that name
+    """
+    kept = []
+    for number, row in rows:
+        if row[field] in stored:
+            kept.append((number, row))
+        else:
+            fail(number, f"{collection}: {errors.get(row[field], 'write failed')}")
+    return kept
+
+
+async def _upsert_by_name(job, collection, field, docs):
+    """
+    One unordered bulk upsert ($setOnInsert) for {name: doc}.
+    Returns ({name: _id} for every name now stored, {name: error}).
+    Inserted ids come from the result; names matched by an existing
+    document, or that lost an insert race to another writer (duplicate
+    key on the unique index), are re-read.
+    """
+    if not docs:
+        return {}, {}
+
+    col = get_collections()[collection]
+    names = list(docs)
+    errors = {}
+
+    try:
+        result = await col.bulk_write(
+            [UpdateOne({field: name}, {"$setOnInsert": docs[name]}, upsert=True) for name in names],
+            ordered=False
+        )
+        upserted = result.upserted_ids
+    except BulkWriteError as e:
+        upserted = {u["index"]: u["_id"] for u in e.details.get("upserted", [])}
+        for error in e.details.get("writeErrors", []):
+            if error.get("code") != DUPLICATE_KEY:
+                errors[names[error["index"]]] = error.get("errmsg", "write failed")
+
+    job.inserted[collection] += len(upserted)
+    ids = {names[index]: _id for index, _id in upserted.items()}
+
+    missing = [name for name in names if name not in ids and name not in errors]
+    if missing:
+        async for doc in col.find({field: {"$in": missing}}, {field: 1}):
+            ids[doc[field]] = doc["_id"]
+
+    return ids, errors
+
+
+async def _import_clients(job, rows, maps, fail):
+    """
+    rows: (row_number, row, password_hash) for rows with client columns
+    """
+    if not rows:
+        return
+
+    ops = []
+    for number, row, password in rows:
+        updates = {
+            "client_name": row["client_name"],
+            "password": password,
+            "role": row["role"],
+            "updated_at": datetime.utcnow()
+        }
+        if row["logo_url"]:
+            updates["logo_path"] = row["logo_url"]
+
+        update = {"$set": updates}
+
+        # Every row of an email not stored yet carries the insert fields:
+        # unordered writes give no guarantee which of them inserts
+        if row["email_id"] not in maps["clients"]:
+            doc = build_client_doc(
+                row["client_name"],
+                row["email_id"],
+                password,
+                row["role"],
+                row["logo_url"],
+                await client_codes.next()
+            )
+            update["$setOnInsert"] = {k: v for k, v in doc.items() if k not in updates}
+
+        ops.append(UpdateOne({"email_id": row["email_id"]}, update, upsert=True))
+
+    errors = await _write_clients(job, ops)
+
+    for index, (number, row, _) in enumerate(rows):
+        if index in errors:
+            fail(number, f"clients: {errors[index]}")
+        else:
+            maps["clients"].add(row["email_id"])
+            profile_cache.invalidate(email_id=row["email_id"])
+
+
+async def _write_clients(job, ops):
+    """
+    Unordered bulk upsert by email. Ops that lost an insert race (duplicate
+    key) run once more, now matching the other writer's document.
+    Returns {op index: error message}.
+    """
+    col = get_collections()["clients"]
+    pending = list(range(len(ops)))
+    errors = {}
+
+    for attempt in range(2):
+        try:
+            result = await col.bulk_write([ops[i] for i in pending], ordered=False)
+            job.inserted["clients"] += result.upserted_count
+            job.updated_clients += result.modified_count
+            return errors
+        except BulkWriteError as e:
+            job.inserted["clients"] += e.details.get("nUpserted", 0)
+            job.updated_clients += e.details.get("nModified", 0)
+
+            retry = []
+            for error in e.details.get("writeErrors", []):
+                index = pending[error["index"]]
+                if error.get("code") == DUPLICATE_KEY and attempt == 0:
+                    retry.append(index)
+                else:
+                    errors[index] = error.get("errmsg", "write failed")
+            pending = retry
+
+        if not pending:
+            break
+
+    return errors
+
+
+async def _refresh_caches():
+    """
+    Once per job instead of per row
+    """
+    catalog.invalidate()
+    client_names.invalidate()
+    industry_names.invalidate()
+    bump_version(*ADD_NEW_SOURCES)
+
+    try:
+        await rebuild_dashboard_snapshot()
+    except Exception as e:
+        print("BULK IMPORT DASHBOARD ERROR:", e)
@@ -0,0 +1,158 @@
+import os
+import time
+import asyncio
+from collections import OrderedDict
+from bson import ObjectId
+from fastapi import Request
+from database import get_collections
+from utils.response_cache import cached_json_response
+
+CATALOG_TTL_SECONDS = int(os.getenv("CATALOG_TTL_SECONDS", "300"))
+# Version lists kept, one per (client scope, industry, project, deliverable)
+CATALOG_VERSIONS_CACHE_SIZE = int(os.getenv("CATALOG_VERSIONS_CACHE_SIZE", "10000"))
+
+
+class CatalogCache:
+    """
+    In-memory industry → project → deliverable tree plus the report
+    versions per (client scope, industry, project, deliverable), shared by
+    the reports and analytics cascades, so steps 1-4 are served without
+    Mongo. The tree is reloaded after the TTL or on invalidate().
+
+    Version lists are loaded per key on first use and kept for the TTL.
+    Reports are written outside this API, so a new version can take up to
+    CATALOG_TTL_SECONDS to appear unless the writer path calls
+    invalidate_versions().
+    """
+
+    def __init__(self, ttl_seconds=CATALOG_TTL_SECONDS, versions_size=CATALOG_VERSIONS_CACHE_SIZE):
+        self.ttl_seconds = ttl_seconds
+        self.versions_size = versions_size
+        self._industries = []
+        self._projects = {}      # industry_id -> [{"id", "name"}]
+        self._deliverables = {}  # project_id -> [{"id", "name"}]
+        # (client_id | None, industry_id, project_id, deliverable_id) -> (versions, expires_at)
+        self._versions = OrderedDict()
+        self._expires_at = 0
+        self._lock = asyncio.Lock()
+
+    async def refresh(self):
+        cols = get_collections()
+
+        industries, projects, deliverables = await asyncio.gather(
+            cols["industries"].find(
+                {},
+                {"_id": 1, "industry_name": 1}
+            ).to_list(None),
+            cols["projects_master"].find(
+                {},
+                {"_id": 1, "project_name": 1, "industry_id": 1}
+            ).to_list(None),
+            cols["deliverables"].find(
+                {},
+                {"_id": 1, "deliverable_name": 1, "project_id": 1}
+            ).to_list(None)
+        )
+
+        project_map = {}
+        for p in projects:
+            project_map.setdefault(p.get("industry_id"), []).append(
+                {"id": str(p["_id"]), "name": p["project_name"]}
+            )
+
+        deliverable_map = {}
+        for d in deliverables:
+            deliverable_map.setdefault(d.get("project_id"), []).append(
+                {"id": str(d["_id"]), "name": d["deliverable_name"]}
+            )
+
+        self._industries = [
+            {"id": str(i["_id"]), "name": i["industry_name"]}
+            for i in industries
+        ]
+        self._projects = project_map
+        self._deliverables = deliverable_map
+        self._expires_at = time.monotonic() + self.ttl_seconds
+
+    async def _ensure_fresh(self):
+        if time.monotonic() >= self._expires_at:
+            async with self._lock:
+                if time.monotonic() >= self._expires_at:
+                    await self.refresh()
+
+    def invalidate(self):
+        self._expires_at = 0
+        self._versions.clear()
+
+    def invalidate_versions(self, deliverable_id: ObjectId | None = None):
+        """
+        Drops cached version lists: all of them, or those of one deliverable
+        """
+        if deliverable_id is None:
+            self._versions.clear()
+            return
+
+        for key in [k for k in self._versions if k[3] == deliverable_id]:
+            del self._versions[key]
+
+    # ==========================
+    # CASCADE STEPS 1 - 4
+    # ==========================
+    async def industries(self):
+        await self._ensure_fresh()
+        return self._industries
+
+    async def projects(self, industry_id: ObjectId):
+        await self._ensure_fresh()
+        return self._projects.get(industry_id, [])
+
+    async def deliverables(self, project_id: ObjectId):
+        await self._ensure_fresh()
+        return self._deliverables.get(project_id, [])
+
+    async def versions(self, industry_id: ObjectId, project_id: ObjectId, deliverable_id: ObjectId, user):
+        # 🔥 Role based filtering: super_admin sees every client's versions
+        client_id = None if user["role"] == "super_admin" else ObjectId(user["client_id"])
+        key = (client_id, industry_id, project_id, deliverable_id)
+
+        entry = self._versions.get(key)
+        if entry and entry[1] > time.monotonic():
+            self._versions.move_to_end(key)
+            return entry[0]
+
+        version_filter = {
+            "industry_id": industry_id,
+            "project_id": project_id,
+            "deliverable_id": deliverable_id,
+            "version": {"$ne": None}  # 🔥 Exclude null versions
+        }
+        if client_id is not None:
+            version_filter["client_id"] = client_id
+
+        versions = sorted(await get_collections()["reports"].distinct("version", version_filter))
+
+        self._versions[key] = (versions, time.monotonic() + self.ttl_seconds)
+        self._versions.move_to_end(key)
+        while len(self._versions) > self.versions_size:
+            self._versions.popitem(last=False)
+
+        return versions
+
+
+catalog = CatalogCache()
+
+
+async def _industries_payload():
+    return {"industries": await catalog.industries()}
+
+
+async def industries_response(request: Request):
+    """
+    Step 1 of both cascades, served from the ETag/compressed response cache
+    """
+    return await cached_json_response(
+        request,
+        "catalog:industries",
+        ("industries",),
+        _industries_payload
+    )
@@ -0,0 +1,89 @@
+import os
+import asyncio
+from pymongo import ReturnDocument
+from database import get_collections, get_db
+
+# Ids reserved per round trip to the counters collection. Unused ids of a
+# block are lost on restart, so codes can have gaps.
+COUNTER_BLOCK_SIZE = int(os.getenv("COUNTER_BLOCK_SIZE", "20"))
+
+
+class SequenceAllocator:
+    """
+    Code numbers from the "counters" collection ({_id: name, seq: n}).
+
+    Each process reserves a block with one atomic $inc and hands ids out
+    locally, so next() is O(1) without a round trip for most calls and
+    never collides with another worker. Ids increase within a process;
+    across workers they are unique but interleave by block.
+    """
+
+    def __init__(self, name, collection, field, prefix, block_size=COUNTER_BLOCK_SIZE):
+        self.name = name
+        self.collection = collection
+        self.field = field
+        self.prefix = prefix
+        self.block_size = block_size
+        self._next = 0
+        self._end = 0  # exclusive
+        self._lock = asyncio.Lock()
+
+    async def next(self) -> int:
+        if self._next >= self._end:
+            async with self._lock:
+                if self._next >= self._end:
+                    await self._reserve()
+
+        value = self._next
+        self._next += 1
+        return value
+
+    async def _reserve(self):
+        counter = await get_collections()["counters"].find_one_and_update(
+            {"_id": self.name},
+            {"$inc": {"seq": self.block_size}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+
+        self._end = counter["seq"] + 1
+        self._next = self._end - self.block_size
+
+    async def seed(self):
+        """
+        Raises the counter to the highest numeric suffix already used
+        (numeric max, so C_10 > C_9). $max never moves it backwards.
+        """
+        db = get_db()
+
+        result = await db[self.collection].aggregate([
+            {"$match": {self.field: {"$regex": f"^{self.prefix}[0-9]+$"}}},
+            {"$group": {
+                "_id": None,
+                "max": {"$max": {"$toLong": {
+                    "$arrayElemAt": [{"$split": [f"${self.field}", "_"]}, 1]
+                }}}
+            }}
+        ]).to_list(length=1)
+
+        highest = (result[0]["max"] if result else None) or 0
+
+        await get_collections()["counters"].update_one(
+            {"_id": self.name},
+            {"$max": {"seq": highest}},
+            upsert=True
+        )
+
+
+client_codes = SequenceAllocator("client_code", "clients", "client_code", "C_")
+project_codes = SequenceAllocator("project_code", "projects_master", "project_code", "PRJ_")
+deliverable_codes = SequenceAllocator("deliverable_code", "deliverables", "deliverable_code", "DEL_")
+
+SEQUENCES = (client_codes, project_codes, deliverable_codes)
+
+
+async def seed_counters():
+    """
+    Called on FastAPI startup, after ensure_indexes()
+    """
+    await asyncio.gather(*(s.seed() for s in SEQUENCES))
@@ -1,13 +1,71 @@
-from database import get_db
+import os
+import asyncio
+from pymongo.errors import DuplicateKeyError
+from database import get_db, RECENT_PROJECTS_SORT
+
+
+PROJECT_STATUS_FIELDS = {
+    "Inprogress": "activeProjects",
+    "Completed": "completedProjects",
+    "Planning": "planningProjects"
+}
+
+# Materialized snapshot stored in the "dashboard" collection
+DASHBOARD_SNAPSHOT_ID = "summary"
+DASHBOARD_RECONCILE_SECONDS = int(os.getenv("DASHBOARD_RECONCILE_SECONDS", "300"))
+RECENT_PROJECTS_LIMIT = 3
+# Rebuilds retried when an incremental update lands mid-rebuild
+DASHBOARD_REBUILD_ATTEMPTS = 3
+
+SNAPSHOT_PROJECTION = {
+    "_id": 0,
+    "admin_dashboard": 1,
+    "clients": 1,
+    "industries": 1,
+    "recent_projects": 1
+}
+
+
+# =========================
+# FORMATTERS
+# =========================
+def format_client(c):
+    return {
+        "name": c.get("client_name", ""),
+        "logo": c.get("logo_path", "")
+    }
+
+
+def format_industry(i):
+    return {
+        "id": i.get("industry_code", ""),
+        "name": i.get("industry_name", ""),
+        "img": i.get("industry_image_url", "")
+    }
+
+
+def format_recent_project(p):
+    return {
+        "id": p.get("project_code", ""),
+        "name": p.get("project_name", ""),
+        "industryId": str(p.get("industry_id", "")),
+        "clientId": "",
+        "location": p.get("location_name", ""),
+        "img": p.get("project_image_path", ""),  # ✅ Added
+        "date": p["created_at"].strftime("%Y-%m-%d") if p.get("created_at") else "",
+        "status": p.get("status", "")
+    }
 
 
 async def build_dashboard_response():
+    """
+    Builds the dashboard summary in four concurrent round trips:
+    active clients, industries, recent projects and one grouped
+    status aggregation on projects_master.
+    """
     db = get_db()
 
-    # =========================
-    # CLIENTS (Active only)
-    # =========================
-    raw_clients = await db["clients"].find(
+    clients_query = db["clients"].find(
         {"status": "Active"},
         {
             "_id": 0,
@@ -16,18 +74,7 @@ async def build_dashboard_response():
         }
     ).to_list(length=None)
 
-    clients = [
-        {
-            "name": c.get("client_name", ""),
-            "logo": c.get("logo_path", "")
-        }
-        for c in raw_clients
-    ]
-
-    # =========================
-    # INDUSTRIES
-    # =========================
-    raw_industries = await db["industries"].find(
+    industries_query = db["industries"].find(
         {},
         {
             "_id": 0,
@@ -37,19 +84,7 @@ async def build_dashboard_response():
         }
     ).to_list(length=None)
 
-    industries = [
-        {
-            "id": i.get("industry_code", ""),
-            "name": i.get("industry_name", ""),
-            "img": i.get("industry_image_url", "")
-        }
-        for i in raw_industries
-    ]
-
-    # =========================
-    # RECENT PROJECTS (TOP 3)
-    # =========================
-    raw_projects = await db["projects_master"].find(
+    projects_query = db["projects_master"].find(
         {"created_at": {"$exists": True}},
         {
             "_id": 0,
@@ -61,50 +96,52 @@ async def build_dashboard_response():
             "project_image_path": 1,   # ✅ Added
             "created_at": 1
         }
-    ).sort("created_at", -1).limit(3).to_list(length=3)
+    ).sort(RECENT_PROJECTS_SORT).limit(RECENT_PROJECTS_LIMIT).to_list(length=RECENT_PROJECTS_LIMIT)
 
-    recent_projects = [
-        {
-            "id": p.get("project_code", ""),
-            "name": p.get("project_name", ""),
-            "industryId": str(p.get("industry_id", "")),
-            "clientId": "",
-            "location": p.get("location_name", ""),
-            "img": p.get("project_image_path", ""),  # ✅ Added
-            "date": p["created_at"].strftime("%Y-%m-%d") if p.get("created_at") else "",
-            "status": p.get("status", "")
-        }
-        for p in raw_projects
-    ]
+    # One $group replaces the four count_documents calls on projects_master
+    status_query = db["projects_master"].aggregate([
+        {"$group": {"_id": "$status", "count": {"$sum": 1}}}
+    ]).to_list(length=None)
+
+    raw_clients, raw_industries, raw_projects, status_counts = await asyncio.gather(
+        clients_query,
+        industries_query,
+        projects_query,
+        status_query
+    )
 
     # =========================
-    # ADMIN DASHBOARD COUNTS (DYNAMIC)
+    # CLIENTS (Active only)
     # =========================
-    total_clients = await db["clients"].count_documents({"status": "Active"})
-    total_industries = await db["industries"].count_documents({})
-    total_projects = await db["projects_master"].count_documents({})
-
-    active_projects = await db["projects_master"].count_documents(
-        {"status": "Inprogress"}
-    )
+    clients = [format_client(c) for c in raw_clients]
 
-    completed_projects = await db["projects_master"].count_documents(
-        {"status": "Completed"}
-    )
+    # =========================
+    # INDUSTRIES
+    # =========================
+    industries = [format_industry(i) for i in raw_industries]
 
-    planning_projects = await db["projects_master"].count_documents(
-        {"status": "Planning"}
-    )
+    # =========================
+    # RECENT PROJECTS (TOP 3)
+    # =========================
+    recent_projects = [format_recent_project(p) for p in raw_projects]
 
+    # =========================
+    # ADMIN DASHBOARD COUNTS (DYNAMIC)
+    # =========================
     admin_dashboard = {
-        "totalClients": total_clients,
-        "totalIndustries": total_industries,
-        "totalProjects": total_projects,
-        "activeProjects": active_projects,
-        "completedProjects": completed_projects,
-        "planningProjects": planning_projects
+        "totalClients": len(raw_clients),
+        "totalIndustries": len(raw_industries),
+        "totalProjects": sum(s["count"] for s in status_counts),
+        "activeProjects": 0,
+        "completedProjects": 0,
+        "planningProjects": 0
     }
 
+    for s in status_counts:
+        field = PROJECT_STATUS_FIELDS.get(s["_id"])
+        if field:
+            admin_dashboard[field] = s["count"]
+
     # =========================
     # FINAL RESPONSE
     # =========================
@@ -114,3 +151,146 @@ async def build_dashboard_response():
         "industries": industries,
         "recent_projects": recent_projects
     }
+
+
+# ======================================================
+# MATERIALIZED SNAPSHOT
+# ======================================================
+
+async def get_dashboard_snapshot():
+    """
+    Single-document read of the materialized dashboard.
+    Falls back to a full rebuild when the snapshot does not exist yet.
+    """
+    db = get_db()
+
+    snapshot = await db["dashboard"].find_one(
+        {"_id": DASHBOARD_SNAPSHOT_ID},
+        SNAPSHOT_PROJECTION
+    )
+
+    if not snapshot:
+        snapshot = await rebuild_dashboard_snapshot()
+
+    return snapshot
+
+
+async def rebuild_dashboard_snapshot():
+    """
+    Recomputes the summary and replaces the stored snapshot if it drifted.
+
+    Every incremental update bumps the snapshot's "version"; the replace
+    only applies to the version read before the rebuild started. If an
+    update landed in between, the rebuild runs again instead of
+    overwriting it.
+    """
+    db = get_db()
+
+    for _ in range(DASHBOARD_REBUILD_ATTEMPTS):
+        current = await db["dashboard"].find_one(
+            {"_id": DASHBOARD_SNAPSHOT_ID},
+            {**SNAPSHOT_PROJECTION, "version": 1}
+        )
+
+        fresh = await build_dashboard_response()
+
+        if current is None:
+            try:
+                await db["dashboard"].insert_one(
+                    {"_id": DASHBOARD_SNAPSHOT_ID, "version": 0, **fresh}
+                )
+                return fresh
+            except DuplicateKeyError:
+                continue  # created concurrently; compare against it
+
+        version = current.pop("version", None)
+        if current == fresh:
+            return fresh
+
+        result = await db["dashboard"].replace_one(
+            {"_id": DASHBOARD_SNAPSHOT_ID, "version": version},
+            {"version": (version or 0) + 1, **fresh}
+        )
+
+        if result.matched_count:
+            print(" Dashboard snapshot drifted, rebuilt")
+            return fresh
+
+    print(" Dashboard snapshot changed during every rebuild attempt, retrying next reconcile")
+    return fresh
+
+
+async def reconcile_dashboard_forever(interval=DASHBOARD_RECONCILE_SECONDS):
+    """
+    Background job started on FastAPI startup
+    """
+    while True:
+        try:
+            await rebuild_dashboard_snapshot()
+        except Exception as e:
+            print("DASHBOARD RECONCILE ERROR:", e)
+
+        await asyncio.sleep(interval)
+
+
+# =========================
+# INCREMENTAL UPDATES
+# =========================
+# Write paths call these after a successful insert/update. A missing
+# snapshot is left alone: the next read rebuilds it.
+
+async def _update_snapshot(update, **kwargs):
+    db = get_db()
+
+    # The version bump makes a concurrent rebuild retry instead of
+    # replacing the snapshot without this update
+    update = {**update, "$inc": {**update.get("$inc", {}), "version": 1}}
+
+    await db["dashboard"].update_one(
+        {"_id": DASHBOARD_SNAPSHOT_ID},
+        update,
+        **kwargs
+    )
+
+
+async def record_client_added(client_doc):
+    if client_doc.get("status") != "Active":
+        return
+
+    await _update_snapshot({
+        "$inc": {"admin_dashboard.totalClients": 1},
+        "$push": {"clients": format_client(client_doc)}
+    })
+
+
+async def record_client_updated(old_name, client_doc):
+    await _update_snapshot(
+        {"$set": {"clients.$[c]": format_client(client_doc)}},
+        array_filters=[{"c.name": old_name}]
+    )
+
+
+async def record_industry_added(industry_doc):
+    await _update_snapshot({
+        "$inc": {"admin_dashboard.totalIndustries": 1},
+        "$push": {"industries": format_industry(industry_doc)}
+    })
+
+
+async def record_project_added(project_doc):
+    inc = {"admin_dashboard.totalProjects": 1}
+
+    status_field = PROJECT_STATUS_FIELDS.get(project_doc.get("status"))
+    if status_field:
+        inc[f"admin_dashboard.{status_field}"] = 1
+
+    await _update_snapshot({
+        "$inc": inc,
+        "$push": {
+            "recent_projects": {
+                "$each": [format_recent_project(project_doc)],
+                "$position": 0,
+                "$slice": RECENT_PROJECTS_LIMIT
+            }
+        }
+    })
@@ -0,0 +1,113 @@
+import os
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import UploadFile, HTTPException
+import cloudinary.uploader
+
+# Global cap: one Cloudinary call per worker thread across all requests
+MEDIA_UPLOAD_WORKERS = int(os.getenv("MEDIA_UPLOAD_WORKERS", "8"))
+# Per-request cap so one large project cannot take every worker
+MEDIA_UPLOADS_PER_REQUEST = int(os.getenv("MEDIA_UPLOADS_PER_REQUEST", "4"))
+# Files above this size go through upload_large in chunks of this size
+# (Cloudinary's minimum chunk is 5 MB)
+MEDIA_UPLOAD_CHUNK_BYTES = int(os.getenv("MEDIA_UPLOAD_CHUNK_BYTES", str(6 * 1024 * 1024)))
+MEDIA_UPLOAD_TIMEOUT_SECONDS = int(os.getenv("MEDIA_UPLOAD_TIMEOUT_SECONDS", "120"))
+
+_executor = ThreadPoolExecutor(
+    max_workers=MEDIA_UPLOAD_WORKERS,
+    thread_name_prefix="media-upload"
+)
+_global_slots = asyncio.Semaphore(MEDIA_UPLOAD_WORKERS)
+
+
+def file_size(upload: UploadFile) -> int:
+    if upload.size is not None:
+        return upload.size
+
+    f = upload.file
+    position = f.tell()
+    f.seek(0, os.SEEK_END)
+    size = f.tell()
+    f.seek(position)
+    return size
+
+
+def _upload_blocking(upload: UploadFile, size, options):
+    """
+    Streams from the spooled temp file; only one chunk of a large file
+    is in memory at a time
+    """
+    upload.file.seek(0)
+
+    if size > MEDIA_UPLOAD_CHUNK_BYTES:
+        return cloudinary.uploader.upload_large(
+            upload.file,
+            chunk_size=MEDIA_UPLOAD_CHUNK_BYTES,
+            **options
+        )
+
+    return cloudinary.uploader.upload(upload.file, **options)
+
+
+def request_upload_slots() -> asyncio.Semaphore:
+    """
+    Per-request cap; pass the same one to every upload_media call of a request
+    """
+    return asyncio.Semaphore(MEDIA_UPLOADS_PER_REQUEST)
+
+
+async def upload_media(
+    uploads: list[UploadFile],
+    request_slots: asyncio.Semaphore | None = None,
+    **options
+) -> list[dict]:
+    """
+    Uploads every file concurrently (bounded per request and globally)
+    and returns, in input order:
+        {"filename", "url", "bytes", "seconds"}
+    Raises 502 naming the first file that failed, after all have finished.
+    """
+    loop = asyncio.get_running_loop()
+    request_slots = request_slots or request_upload_slots()
+
+    async def upload_one(upload: UploadFile):
+        size = file_size(upload)
+
+        async with request_slots, _global_slots:
+            start = time.perf_counter()
+            result = await loop.run_in_executor(
+                _executor,
+                _upload_blocking,
+                upload,
+                size,
+                {
+                    "filename": upload.filename,
+                    "timeout": MEDIA_UPLOAD_TIMEOUT_SECONDS,
+                    **options
+                }
+            )
+
+        return {
+            "filename": upload.filename,
+            "url": result["secure_url"],
+            "bytes": size,
+            "seconds": round(time.perf_counter() - start, 3)
+        }
+
+    # Wait for every upload before raising: the temp files are closed
+    # when the request ends and executor threads may still be reading them
+    results = await asyncio.gather(
+        *(upload_one(u) for u in uploads),
+        return_exceptions=True
+    )
+
+    for upload, result in zip(uploads, results):
+        if isinstance(result, Exception):
+            print("MEDIA UPLOAD ERROR:", upload.filename, result)
+            raise HTTPException(
+                status_code=502,
+                detail=f"Upload failed for {upload.filename}"
+            )
+
+    return results
@@ -0,0 +1,92 @@
+import os
+import time
+import asyncio
+from database import get_collections
+
+NAME_MAP_TTL_SECONDS = int(os.getenv("NAME_MAP_TTL_SECONDS", "300"))
+
+
+class IdNameMap:
+    """
+    In-process _id → name dictionary for a reference collection.
+    Unknown ids are fetched with a single $in query; entries expire after the TTL.
+    """
+
+    def __init__(self, collection, name_field, ttl_seconds=NAME_MAP_TTL_SECONDS):
+        self.collection = collection
+        self.name_field = name_field
+        self.ttl_seconds = ttl_seconds
+        self._names = {}  # _id -> (name, expires_at)
+
+    async def resolve(self, ids):
+        now = time.monotonic()
+        names = {}
+        missing = set()
+
+        for _id in ids:
+            if _id is None:
+                continue
+
+            entry = self._names.get(_id)
+            if entry and entry[1] > now:
+                names[_id] = entry[0]
+            else:
+                missing.add(_id)
+
+        if missing:
+            docs = await get_collections()[self.collection].find(
+                {"_id": {"$in": list(missing)}},
+                {self.name_field: 1}
+            ).to_list(None)
+
+            expires_at = now + self.ttl_seconds
+            for d in docs:
+                name = d.get(self.name_field)
+                self._names[d["_id"]] = (name, expires_at)
+                names[d["_id"]] = name
+
+        return names
+
+    def invalidate(self, _id=None):
+        if _id is None:
+            self._names.clear()
+        else:
+            self._names.pop(_id, None)
+
+
+class PreloadedNameMap(IdNameMap):
+    """
+    Keeps the whole collection in memory; meant for small lookup tables
+    such as industries. Reloaded after the TTL or on invalidate().
+    """
+
+    def __init__(self, collection, name_field, ttl_seconds=NAME_MAP_TTL_SECONDS):
+        super().__init__(collection, name_field, ttl_seconds)
+        self._expires_at = 0
+        self._lock = asyncio.Lock()
+
+    async def refresh(self):
+        docs = await get_collections()[self.collection].find(
+            {},
+            {self.name_field: 1}
+        ).to_list(None)
+
+        self._names = {d["_id"]: d.get(self.name_field) for d in docs}
+        self._expires_at = time.monotonic() + self.ttl_seconds
+
+    async def resolve(self, ids):
+        if time.monotonic() >= self._expires_at:
+            async with self._lock:
+                if time.monotonic() >= self._expires_at:
+                    await self.refresh()
+
+        return {_id: self._names[_id] for _id in ids if _id in self._names}
+
+    def invalidate(self, _id=None):
+        self._expires_at = 0
+
+
+# Shared maps
+project_names = IdNameMap("projects_master", "project_name")
+client_names = IdNameMap("clients", "client_name")
+industry_names = PreloadedNameMap("industries", "industry_name")
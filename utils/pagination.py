@@ -0,0 +1,53 @@
+import base64
+import json
+from datetime import datetime
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import HTTPException
+
+
+# ======================================================
+# KEYSET CURSORS → (sort_value, _id) encoded as an opaque token
+# ======================================================
+
+def encode_cursor(sort_value: datetime, doc_id: ObjectId) -> str:
+    raw = json.dumps([sort_value.isoformat(), str(doc_id)])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        sort_value, doc_id = json.loads(raw)
+        return datetime.fromisoformat(sort_value), ObjectId(doc_id)
+    except (ValueError, TypeError, InvalidId):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_filter(field: str, cursor: str | None) -> dict:
+    """
+    Filter for the page after `cursor` when sorting by (field, _id) descending.
+    Documents without a date in `field` cannot carry a cursor and are excluded.
+    """
+    if not cursor:
+        return {field: {"$type": "date"}}
+
+    sort_value, doc_id = decode_cursor(cursor)
+
+    return {
+        "$or": [
+            {field: {"$lt": sort_value}},
+            {field: sort_value, "_id": {"$lt": doc_id}}
+        ]
+    }
+
+
+def next_cursor(field: str, docs: list, limit: int) -> str | None:
+    """
+    Cursor for the following page, None when this page is the last one
+    """
+    if len(docs) < limit:
+        return None
+
+    last = docs[-1]
+    return encode_cursor(last[field], last["_id"])
@@ -0,0 +1,102 @@
+import os
+import gzip
+import time
+import hashlib
+from email.utils import formatdate
+from fastapi import Request, Response
+from utils.mongo_serializer import dumps_mongo
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+RESPONSE_CACHE_MAX_AGE_SECONDS = int(os.getenv("RESPONSE_CACHE_MAX_AGE_SECONDS", "60"))
+
+# Per-collection version counters, bumped by write paths
+_versions = {}
+_modified = {}
+
+_entries = {}
+
+
+def bump_version(*collections):
+    now = time.time()
+    for collection in collections:
+        _versions[collection] = _versions.get(collection, 0) + 1
+        _modified[collection] = now
+
+
+class CachedBody:
+    """
+    One encoded response body, stored uncompressed and pre-compressed
+    """
+
+    __slots__ = ("versions", "identity", "gzip", "br", "etag", "last_modified", "expires_at")
+
+    def __init__(self, versions, body, last_modified):
+        self.versions = versions
+        self.identity = body
+        self.gzip = gzip.compress(body, compresslevel=6)
+        self.br = brotli.compress(body) if brotli else None
+        self.etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        self.last_modified = formatdate(last_modified, usegmt=True)
+        # Bounds staleness for writes made by other workers
+        self.expires_at = time.monotonic() + RESPONSE_CACHE_MAX_AGE_SECONDS
+
+
+def _accepted_encodings(header):
+    accepted = set()
+    for part in header.split(","):
+        token, _, params = part.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0"):
+            continue
+        accepted.add(token.strip().lower())
+    return accepted
+
+
+def _etag_matches(header, etag):
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+async def cached_json_response(request: Request, key: str, collections, build) -> Response:
+    """
+    Serves `await build()` as JSON from the cache while the versions of
+    `collections` are unchanged. Honors If-None-Match and Accept-Encoding.
+    """
+    versions = tuple(_versions.get(c, 0) for c in collections)
+    entry = _entries.get(key)
+
+    if not entry or entry.versions != versions or entry.expires_at <= time.monotonic():
+        content = await build()
+        last_modified = max((_modified.get(c, 0) for c in collections), default=0) or time.time()
+        entry = CachedBody(versions, dumps_mongo(content).encode("utf-8"), last_modified)
+        _entries[key] = entry
+
+    headers = {
+        "ETag": entry.etag,
+        "Last-Modified": entry.last_modified,
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding"
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, entry.etag):
+        return Response(status_code=304, headers=headers)
+
+    accepted = _accepted_encodings(request.headers.get("accept-encoding", ""))
+
+    if entry.br is not None and "br" in accepted:
+        body = entry.br
+        headers["Content-Encoding"] = "br"
+    elif "gzip" in accepted:
+        body = entry.gzip
+        headers["Content-Encoding"] = "gzip"
+    else:
+        body = entry.identity
+
+    return Response(content=body, media_type="application/json", headers=headers)